@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
+from app.core.html_text import html_to_text
 from app.models.external.intercom import IntercomConversationRaw
 from app.models.internal.conversation import (
     InternalConversation,
@@ -79,6 +80,7 @@ def map_intercom_to_internal(payload: IntercomConversationRaw) -> InternalConver
                 author_participant_id=str(conv_msg_author.get("id", "unknown")),
                 sent_at=created_at,  # Intercom doesn't always provide a per-message timestamp here
                 content=str(conv_msg_body),
+                content_text=html_to_text(str(conv_msg_body)),  # Intercom bodies are HTML
             )
         )
 
@@ -96,6 +98,7 @@ def map_intercom_to_internal(payload: IntercomConversationRaw) -> InternalConver
                 author_participant_id=str(author.get("id", "unknown")),
                 sent_at=_ts_to_dt(part.get("created_at")),
                 content=str(body),
+                content_text=html_to_text(str(body)),
             )
         )
 
@@ -59,13 +59,15 @@ EXAMPLE_INTERNAL_CONVERSATION = {
             "id": "409820079",
             "author_participant_id": "5310d8e7598c9a0b24000002",
             "sent_at": "2019-09-05T14:20:09Z",
-            "content": "Initial message",
+            "content": "<p>Initial message</p>",
+            "content_text": "Initial message",
         },
         {
             "id": "1223445555",
             "author_participant_id": "5310d8e7598c9a0b24000002",
             "sent_at": "2019-09-05T14:21:13Z",
-            "content": "Follow-up message",
+            "content": "<p>Follow-up message</p>",
+            "content_text": "Follow-up message",
         },
     ],
 }
@@ -1,23 +1,27 @@
-from fastapi import APIRouter, Request, Response, status
+from fastapi import APIRouter, Request, status
 from app.models.external.intercom import IntercomConversationRaw
 from app.services.ingestion import IngestResponse, IngestionService
 from app.api.openapi.responses import INGEST_INTERCOM_RESPONSES
+from app.api.routing import DedupCachedRoute
+from app.core.responses import ModelJSONResponse
 
 
-router = APIRouter(prefix="/integrations/intercom", tags=["integrations"])
+router = APIRouter(prefix="/integrations/intercom", tags=["integrations"], route_class=DedupCachedRoute)
 
 
 @router.post(
     "/conversations",
     response_model=IngestResponse,
+    response_class=ModelJSONResponse,
     responses=INGEST_INTERCOM_RESPONSES,
 )
-def ingest_intercom_conversation(payload: IntercomConversationRaw, 
-                                 request: Request, 
-                                 response: Response,) -> IngestResponse:
-    service = IngestionService(request.app.state.repo)
-    result = service.ingest_intercom(payload)
-    response.status_code = (
+async def ingest_intercom_conversation(payload: IntercomConversationRaw,
+                                       request: Request) -> ModelJSONResponse:
+    service = IngestionService(request.app.state.repo, request.app.state.dedup_cache, request.app.state.events)
+    # Set by DedupCachedRoute when the raw body was not an exact redelivery
+    result = await service.ingest_intercom(payload, getattr(request.state, "content_hash", None))
+    status_code = (
         status.HTTP_200_OK if result.deduplicated else status.HTTP_201_CREATED
     )
-    return result
+    # Ingest acks are ~150 bytes: never worth compressing
+    return ModelJSONResponse(result, status_code=status_code, minimum_size=None)
@@ -1,34 +1,73 @@
+from functools import partial
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Request, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Header, Query, Request, status
+from fastapi.responses import StreamingResponse
 from app.models.errors import ErrorResponse
 
 from app.models.internal.conversation import ConversationListResponse, InternalConversation
 from app.api.openapi.responses import GET_CONVERSATION_RESPONSES, LIST_CONVERSATIONS_RESPONSES
+from app.core.responses import DEFAULT_MINIMUM_SIZE, ModelJSONResponse, render_response
+from app.services.events import event_stream
 
 router = APIRouter(prefix="/internal", tags=["internal"])
 
+# Compression thresholds (bytes) per route; list/detail payloads grow with conversation size.
+LIST_MINIMUM_SIZE = DEFAULT_MINIMUM_SIZE
+DETAIL_MINIMUM_SIZE = DEFAULT_MINIMUM_SIZE
+
 
 @router.get("/conversations", 
             response_model=ConversationListResponse, 
+            response_class=ModelJSONResponse,
             responses=LIST_CONVERSATIONS_RESPONSES)
-def list_conversations(request: Request) -> ConversationListResponse:
-    return request.app.state.repo.list_conversations()
+async def list_conversations(request: Request) -> ModelJSONResponse:
+    repo = request.app.state.repo
+    conversations = await repo.list_conversations_async()
+    # Serializing + gzipping a large list takes tens of ms: keep it off the event loop
+    return await repo.read_executor.run(
+        partial(render_response, conversations, request.headers.get("accept-encoding"), minimum_size=LIST_MINIMUM_SIZE)
+    )
+
+
+# Declared before /conversations/{conversation_id} so "stream" isn't parsed as a UUID
+@router.get(
+    "/conversations/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}, "description": "SSE stream of ConversationListItem"}},
+)
+async def stream_conversations(
+    request: Request,
+    last_event_id: Optional[int] = Header(default=None, alias="Last-Event-ID"),
+    since: Optional[int] = Query(default=None, description="Resume after this event id (for clients that can't set headers)"),
+) -> StreamingResponse:
+    resume_from = last_event_id if last_event_id is not None else since
+    stream = event_stream(request.app.state.events, request.app.state.repo, resume_from)
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        # Keep proxies from buffering or caching the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get(
     "/conversations/{conversation_id}",
     response_model=InternalConversation,
+    response_class=ModelJSONResponse,
     responses=GET_CONVERSATION_RESPONSES,
 )
-def get_conversation(conversation_id: UUID, request: Request) -> InternalConversation:
-    conversation = request.app.state.repo.get_conversation(conversation_id)
+async def get_conversation(conversation_id: UUID, request: Request) -> ModelJSONResponse:
+    repo = request.app.state.repo
+    conversation = await repo.get_conversation_async(conversation_id)
     if conversation is None:
         body = ErrorResponse(
             error_code="not_found",
             message="Conversation not found",
             details=None,
         )
-        return JSONResponse(status_code=status.HTTP_404_NOT_FOUND, content=body.model_dump())
-    return conversation
+        return ModelJSONResponse(body, status_code=status.HTTP_404_NOT_FOUND, minimum_size=None)
+    return await repo.read_executor.run(
+        partial(render_response, conversation, request.headers.get("accept-encoding"), minimum_size=DETAIL_MINIMUM_SIZE)
+    )
@@ -0,0 +1,84 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Query, Request, status
+from fastapi.responses import StreamingResponse
+
+from app.core.responses import ModelJSONResponse
+from app.models.errors import ErrorResponse
+from app.services.export import (
+    ARROW,
+    CONVERSATIONS,
+    CSV,
+    ENCODERS,
+    EXPORT_BATCH_SIZE,
+    MESSAGES,
+    arrow_available,
+    export_stream,
+)
+
+router = APIRouter(prefix="/internal/export", tags=["internal"])
+
+EXPORT_RESPONSES = {
+    200: {
+        "content": {"text/csv": {}, "application/vnd.apache.arrow.stream": {}},
+        "description": "Flat columnar snapshot, streamed in batches",
+    },
+    400: {"model": ErrorResponse, "description": "Requested format is not available on this server"},
+}
+
+
+async def _export_response(
+    request: Request, table: str, format: str, after: int, updated_since: Optional[datetime], batch_size: int
+):
+    if format == ARROW and not arrow_available():
+        body = ErrorResponse(
+            error_code="unsupported_format",
+            message="Arrow export requires the optional 'pyarrow' package; use format=csv",
+            details=None,
+        )
+        return ModelJSONResponse(body, status_code=status.HTTP_400_BAD_REQUEST, minimum_size=None)
+
+    repo = request.app.state.repo
+    encoder = ENCODERS[format]
+    # Snapshot bound: rows ingested while streaming wait for the next export
+    upto = await repo.latest_position_async()
+    stream = export_stream(repo, table, format, updated_since, batch_size, after, upto)
+    return StreamingResponse(
+        stream,
+        media_type=encoder.media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{table}.{encoder.extension}"',
+            "X-Export-Watermark": str(max(after, upto)),
+        },
+    )
+
+
+@router.get("/messages", response_class=StreamingResponse, responses=EXPORT_RESPONSES)
+async def export_messages(
+    request: Request,
+    format: Literal["csv", "arrow"] = Query(default=CSV),
+    after: int = Query(
+        default=0, ge=0, description="X-Export-Watermark of the previous export (incremental export)"
+    ),
+    updated_since: Optional[datetime] = Query(
+        default=None, description="Only conversations updated at/after this time (filter)"
+    ),
+    batch_size: int = Query(default=EXPORT_BATCH_SIZE, ge=1, le=5000, description="Conversations read per batch"),
+):
+    return await _export_response(request, MESSAGES, format, after, updated_since, batch_size)
+
+
+@router.get("/conversations", response_class=StreamingResponse, responses=EXPORT_RESPONSES)
+async def export_conversations(
+    request: Request,
+    format: Literal["csv", "arrow"] = Query(default=CSV),
+    after: int = Query(
+        default=0, ge=0, description="X-Export-Watermark of the previous export (incremental export)"
+    ),
+    updated_since: Optional[datetime] = Query(
+        default=None, description="Only conversations updated at/after this time (filter)"
+    ),
+    batch_size: int = Query(default=EXPORT_BATCH_SIZE, ge=1, le=5000, description="Conversations read per batch"),
+):
+    return await _export_response(request, CONVERSATIONS, format, after, updated_since, batch_size)
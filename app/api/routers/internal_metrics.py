@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Request
+
+from app.core.responses import ModelJSONResponse
+from app.models.internal.metrics import (
+    DedupCacheStats,
+    EventStreamStats,
+    ExecutorStats,
+    ExecutorsStats,
+    MetricsResponse,
+    WriteLockStats,
+)
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+@router.get("/metrics", response_model=MetricsResponse, response_class=ModelJSONResponse)
+async def get_metrics(request: Request) -> ModelJSONResponse:
+    # In-memory counters only: safe to compute on the event loop
+    repo = request.app.state.repo
+    metrics = MetricsResponse(
+        dedup_cache=DedupCacheStats(**request.app.state.dedup_cache.stats()),
+        write_lock=WriteLockStats(**repo.write_stats.stats()),
+        executors=ExecutorsStats(
+            read=ExecutorStats(**repo.read_executor.stats()),
+            write=ExecutorStats(**repo.write_executor.stats()),
+        ),
+        event_stream=EventStreamStats(**request.app.state.events.stats()),
+    )
+    return ModelJSONResponse(metrics, minimum_size=None)
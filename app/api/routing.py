@@ -0,0 +1,43 @@
+from typing import Callable
+
+from fastapi import Request, Response, status
+from fastapi.routing import APIRoute
+
+from app.core.responses import ModelJSONResponse
+from app.services.dedup_cache import content_hash
+from app.services.ingestion import IngestResponse
+
+
+class DedupCachedRoute(APIRoute):
+    """Ingestion route that answers exact webhook redeliveries from memory.
+
+    The raw body is hashed before FastAPI validates it. If the hash is in the
+    app's DedupCache, the original internal id is returned straight away
+    (200 + deduplicated=true) with no validation, mapping or DB access.
+    Otherwise the hash is handed to the endpoint via `request.state.content_hash`
+    and the normal route handler runs.
+    """
+
+    def get_route_handler(self) -> Callable:
+        original_route_handler = super().get_route_handler()
+
+        async def dedup_route_handler(request: Request) -> Response:
+            cache = getattr(request.app.state, "dedup_cache", None)
+            if cache is None:
+                return await original_route_handler(request)
+
+            body_hash = content_hash(await request.body())
+            entry = cache.lookup(body_hash)
+            if entry is not None:
+                result = IngestResponse(
+                    id=entry.internal_id,
+                    provider=entry.provider,
+                    external_id=entry.external_id,
+                    deduplicated=True,
+                )
+                return ModelJSONResponse(result, status_code=status.HTTP_200_OK, minimum_size=None)
+
+            request.state.content_hash = body_hash
+            return await original_route_handler(request)
+
+        return dedup_route_handler
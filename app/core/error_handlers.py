@@ -2,9 +2,11 @@ from typing import List
 from fastapi import Request
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
-from starlette.status import HTTP_400_BAD_REQUEST, HTTP_422_UNPROCESSABLE_ENTITY
+from starlette.status import HTTP_400_BAD_REQUEST, HTTP_422_UNPROCESSABLE_ENTITY, HTTP_503_SERVICE_UNAVAILABLE
 
 from app.models.errors import ErrorResponse, FieldError
+from app.repositories.executor import RepositoryTimeoutError
+from app.repositories.sqlite_write import DatabaseBusyError
 
 
 def build_field_errors(exception: RequestValidationError) -> List[FieldError]:
@@ -70,3 +72,34 @@ async def request_validation_exception_handler(request: Request, exc: RequestVal
         details=details,
     )
     return JSONResponse(status_code=HTTP_422_UNPROCESSABLE_ENTITY, content=body.model_dump())
+
+
+async def database_busy_exception_handler(request: Request, exc: DatabaseBusyError):
+    """503 + Retry-After when the SQLite write lock stayed busy past the retry budget.
+
+    Webhook providers retry on 5xx, so this is a safe "try again shortly" rather than a 500.
+    """
+    body = ErrorResponse(
+        error_code="database_busy",
+        message="Database is busy, retry later",
+        details=None,
+    )
+    return JSONResponse(
+        status_code=HTTP_503_SERVICE_UNAVAILABLE,
+        content=body.model_dump(),
+        headers={"Retry-After": "1"},
+    )
+
+
+async def repository_timeout_exception_handler(request: Request, exc: RepositoryTimeoutError):
+    """503 + Retry-After when a repository operation exceeded its per-operation timeout."""
+    body = ErrorResponse(
+        error_code="timeout",
+        message="Storage operation timed out, retry later",
+        details=None,
+    )
+    return JSONResponse(
+        status_code=HTTP_503_SERVICE_UNAVAILABLE,
+        content=body.model_dump(),
+        headers={"Retry-After": "1"},
+    )
@@ -0,0 +1,117 @@
+import re
+from html import unescape
+from typing import List, Set
+
+# Elements whose content is never visible text (skipped up to their closing tag)
+_INVISIBLE = frozenset({"script", "style", "head", "template", "noscript"})
+_CLOSING = {name: re.compile(rf"</{name}\b", re.IGNORECASE) for name in _INVISIBLE}
+# Tags that end a line of text (opening or closing)
+_LINE_BREAK = frozenset(
+    {"br", "p", "div", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "table",
+     "blockquote", "pre", "section", "article", "header", "footer"}
+)
+# A real tag starts with "<" followed by a letter, "/", "!" or "?" (so "a < b" survives)
+_TAG_NAME = re.compile(r"/?([a-zA-Z][^\s/>]*)")
+_INLINE_SPACE = re.compile(r"[ \t\f\v\r\u00a0]+")
+
+
+def _tag_end(body: str, pos: int, limit: int) -> int:
+    """Index of the ">" closing the tag whose body starts at `pos`, or -1 if none before `limit`.
+
+    A ">" inside a quoted attribute value does not end the tag. Each search result is
+    reused until the scan passes it, so a tag is scanned once however many quotes it has.
+    """
+    end = double = single = -2
+    while True:
+        if end < pos:
+            end = body.find(">", pos, limit)
+            if end < 0:
+                return -1
+        if 0 <= double < pos or double == -2:
+            double = body.find('"', pos, end)
+        if 0 <= single < pos or single == -2:
+            single = body.find("'", pos, end)
+        quotes = [q for q in (double, single) if pos <= q < end]
+        if not quotes:
+            return end
+        quote = min(quotes)
+        closing = body.find(body[quote], quote + 1, limit)
+        if closing < 0:
+            return -1
+        pos = closing + 1
+        double = single = -2
+
+
+def html_to_text(body: str) -> str:
+    """Normalize an HTML message body to plain text.
+
+    A single forward scan, linear in the body size even on hostile input such as
+    thousands of unclosed tags, comments or quotes:
+    - drops comments and script/style-like blocks (an unclosed one hides the rest,
+      as in a browser; an unclosed <head> only drops the tag)
+    - turns <br> and block-level tags into line breaks, removes all other tags
+      (a ">" inside a quoted attribute value does not end the tag; quoted values
+      containing "<" are not supported)
+    - decodes entities in text only, so "&lt;b&gt;" stays literal text
+    - collapses runs of spaces and drops blank lines
+
+    A "<" that does not start a complete tag is kept as text.
+    Plain-text bodies (no "<" or "&") only get the whitespace normalization.
+    """
+    if "<" in body:
+        body = "".join(_strip_tags(body))
+    if "&" in body:
+        body = unescape(body)
+
+    lines = (_INLINE_SPACE.sub(" ", line).strip() for line in body.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _strip_tags(body: str) -> List[str]:
+    # Every tag ends before the next "<", so each stretch of text is scanned a bounded
+    # number of times; searches that can't succeed later (closing tags) are remembered.
+    unclosed: Set[str] = set()
+    parts: List[str] = []
+    size = len(body)
+    i = 0
+    start = body.find("<")
+    while start >= 0:
+        parts.append(body[i:start])
+
+        if body.startswith("<!--", start):
+            end = body.find("-->", start + 4)
+            if end < 0:
+                return parts  # unclosed comment: the rest is comment
+            i = end + 3
+            start = body.find("<", i)
+            continue
+
+        following = start + 1
+        next_start = body.find("<", following)
+        limit = next_start if next_start >= 0 else size
+        name_match = _TAG_NAME.match(body, following, limit)
+        end = _tag_end(body, following, limit) if name_match or body[following:following + 1] in ("!", "?") else -1
+        if end < 0:
+            parts.append("<")  # "a < b", or never closed: not a tag
+            i, start = following, next_start
+            continue
+        i = end + 1
+
+        name = name_match.group(1).lower() if name_match else ""  # "" for <!doctype>, <?xml?>
+        if name in _LINE_BREAK:
+            parts.append("\n")
+        elif name in _INVISIBLE and not name_match.group(0).startswith("/"):
+            closing = _CLOSING[name].search(body, i) if name not in unclosed else None
+            if closing is not None:
+                close_end = body.find(">", closing.end())
+                if close_end < 0:
+                    return parts
+                i = close_end + 1
+            else:
+                unclosed.add(name)
+                if name != "head":
+                    return parts  # unclosed script/style: the rest is not visible text
+                # browsers close <head> implicitly: keep what follows
+        start = body.find("<", i)
+    parts.append(body[i:])
+    return parts
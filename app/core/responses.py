@@ -0,0 +1,150 @@
+import gzip
+import zlib
+from typing import Any, Dict, Mapping, Optional
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+
+# Bodies smaller than this are not worth the CPU (and gzip header overhead) to compress.
+DEFAULT_MINIMUM_SIZE = 1024
+DEFAULT_COMPRESSLEVEL = 6
+
+# Preference order when the client accepts several encodings with the same q-value.
+SUPPORTED_ENCODINGS = ("gzip", "deflate")
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q-value}.
+
+    Malformed q-values are treated as 0 (not acceptable) rather than raising,
+    so a bad header only disables compression instead of failing the request.
+    """
+    accepted: Dict[str, float] = {}
+    for item in header.split(","):
+        parts = [p.strip() for p in item.split(";")]
+        coding = parts[0].lower()
+        if not coding:
+            continue
+
+        q = 1.0
+        for param in parts[1:]:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate_encoding(header: Optional[str]) -> Optional[str]:
+    """Pick the best supported content-coding for an Accept-Encoding header (or None)."""
+    if not header:
+        return None
+
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+
+    best: Optional[str] = None
+    best_q = 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress_body(body: bytes, encoding: str, compresslevel: int = DEFAULT_COMPRESSLEVEL) -> bytes:
+    """Compress a body with the given HTTP content-coding.
+
+    Note: HTTP "deflate" is the zlib-wrapped format (RFC 9110), not raw deflate.
+    """
+    if encoding == "gzip":
+        # mtime=0 keeps the output deterministic for identical bodies (cache/ETag friendly)
+        return gzip.compress(body, compresslevel=compresslevel, mtime=0)
+    if encoding == "deflate":
+        return zlib.compress(body, compresslevel)
+    raise ValueError(f"Unsupported content-coding: {encoding}")
+
+
+class ModelJSONResponse(Response):
+    """JSON response that serializes Pydantic models straight to bytes.
+
+    FastAPI's default path turns a returned model into a dict (jsonable_encoder)
+    and then json.dumps() it. Returning this response from a route skips that
+    round-trip: models are rendered with `model_dump_json()` (pydantic-core),
+    other values with `pydantic_core.to_json`.
+
+    Compression is negotiated per request from Accept-Encoding (gzip/deflate) when
+    the rendered body is at least `minimum_size` bytes. Pass `minimum_size=None`
+    to disable compression for a route.
+
+    Rendering happens in __init__ and compression in __call__, i.e. on the event
+    loop. For large bodies build the response with `render_response()` on a worker
+    thread instead, which also compresses it there.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        background: Optional[BackgroundTask] = None,
+        minimum_size: Optional[int] = DEFAULT_MINIMUM_SIZE,
+        compresslevel: int = DEFAULT_COMPRESSLEVEL,
+    ) -> None:
+        # Set before super().__init__(), which calls render()
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+        self._encoded = False
+        super().__init__(content, status_code, headers, media_type, background)
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode("utf-8")
+        return to_json(content)
+
+    def _should_compress(self) -> bool:
+        return (
+            self.minimum_size is not None
+            and len(self.body) >= self.minimum_size
+            and "content-encoding" not in self.headers
+        )
+
+    def encode(self, accept_encoding: Optional[str]) -> "ModelJSONResponse":
+        """Negotiate and apply compression now (once) rather than when the response is sent."""
+        if not self._encoded and self._should_compress():
+            # The body varies by Accept-Encoding from here on, even if we end up not compressing
+            self.headers.append("vary", "Accept-Encoding")
+
+            encoding = negotiate_encoding(accept_encoding)
+            if encoding is not None:
+                self.body = compress_body(self.body, encoding, self.compresslevel)
+                self.headers["content-encoding"] = encoding
+                self.headers["content-length"] = str(len(self.body))
+        self._encoded = True
+        return self
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self._encoded:
+            request_headers = dict(scope.get("headers") or [])
+            self.encode(request_headers.get(b"accept-encoding", b"").decode("latin-1"))
+
+        await super().__call__(scope, receive, send)
+
+
+def render_response(content: Any, accept_encoding: Optional[str], **kwargs: Any) -> ModelJSONResponse:
+    """Render and compress a ModelJSONResponse in the calling thread.
+
+    Blocking by design: routes run it on a repository executor so that serializing
+    and gzipping large bodies never stalls the event loop.
+    """
+    return ModelJSONResponse(content, **kwargs).encode(accept_encoding)
@@ -1,29 +1,63 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from app.api.routers.integrations_intercom import router as intercom_router
 from app.api.routers.internal_conversations import router as internal_router
+from app.api.routers.internal_export import router as export_router
+from app.api.routers.internal_metrics import router as metrics_router
 from app.repositories.conversations import ConversationRepository
+from app.services.dedup_cache import DedupCache
+from app.services.events import ConversationEventBroker
 from fastapi.exceptions import RequestValidationError
-from app.core.error_handlers import request_validation_exception_handler
+from app.core.error_handlers import (
+    database_busy_exception_handler,
+    repository_timeout_exception_handler,
+    request_validation_exception_handler,
+)
+from app.repositories.executor import RepositoryTimeoutError
+from app.repositories.sqlite_write import DatabaseBusyError
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Stop the event log tail, let in-flight DB operations finish, then stop the repository's executors
+    await app.state.events.close()
+    app.state.repo.close()
 
 
 def create_app() -> FastAPI:
     app = FastAPI(
         title="KBMS Backend Integration Service (Skeleton)",
         version="0.0.1",
+        lifespan=lifespan,
     )
     app.add_exception_handler(RequestValidationError, request_validation_exception_handler)
+    app.add_exception_handler(DatabaseBusyError, database_busy_exception_handler)
+    app.add_exception_handler(RepositoryTimeoutError, repository_timeout_exception_handler)
 
     repo = ConversationRepository()
     repo._init_db()
     app.state.repo = repo
 
+    # Exact webhook redeliveries are answered from memory; warm up from recent ingests
+    dedup_cache = DedupCache()
+    dedup_cache.warm_up(repo.recent_dedup_entries(dedup_cache.capacity))
+    app.state.dedup_cache = dedup_cache
+
+    # One tail of the event log per worker, fanned out to GET /internal/conversations/stream
+    app.state.events = ConversationEventBroker(repo)
+
 
     app.include_router(intercom_router)
     app.include_router(internal_router)
+    app.include_router(metrics_router)
+    app.include_router(export_router)
 
+    # async: answered on the event loop, never waits for a threadpool slot
     @app.get("/health")
-    def health():
+    async def health():
         return {"status": "ok"}
 
     return app
@@ -19,6 +19,8 @@ class InternalMessage(BaseModel):
     author_participant_id: str
     sent_at: datetime
     content: str
+    # Plain-text rendering of `content` (provider HTML stripped once at ingest)
+    content_text: Optional[str] = None
 
 
 class InternalConversation(BaseModel):
@@ -51,3 +53,11 @@ class ConversationListItem(BaseModel):
 class ConversationListResponse(BaseModel):
     model_config = ConfigDict(extra="forbid")
     items: List[ConversationListItem]
+
+
+class ConversationEvent(BaseModel):
+    """One "conversation ingested" event; `seq` is the durable, monotonically increasing event id."""
+
+    model_config = ConfigDict(extra="forbid")
+    seq: int
+    item: ConversationListItem
@@ -0,0 +1,55 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class DedupCacheStats(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    size: int
+    capacity: int
+    hits: int
+    misses: int
+    evictions: int
+    hit_rate: float
+
+
+class WriteLockStats(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    transactions: int
+    busy_retries: int
+    busy_failures: int
+    lock_wait_avg_ms: float
+    lock_wait_max_ms: float
+
+
+class ExecutorStats(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    max_workers: int
+    queued: int
+    active: int
+    completed: int
+    timeouts: int
+    dropped: int
+    queue_wait_avg_ms: float
+    queue_wait_max_ms: float
+
+
+class ExecutorsStats(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    read: ExecutorStats
+    write: ExecutorStats
+
+
+class EventStreamStats(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    subscribers: int
+    notified: int
+    published: int
+    disconnected: int
+    log_reads: int
+
+
+class MetricsResponse(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    dedup_cache: DedupCacheStats
+    write_lock: WriteLockStats
+    executors: ExecutorsStats
+    event_stream: EventStreamStats
@@ -1,70 +1,301 @@
-from typing import Optional
+from datetime import datetime, timezone
+from functools import partial
+from typing import Callable, Iterable, List, Optional
 from uuid import UUID
 
-from app.models.internal.conversation import ConversationListResponse, InternalConversation, ConversationListItem
+from app.models.internal.conversation import (
+    ConversationEvent,
+    ConversationListItem,
+    ConversationListResponse,
+    InternalConversation,
+)
+from app.repositories.executor import RepositoryExecutor
+from app.repositories.partitions import (
+    ACTIVE,
+    ARCHIVED,
+    PartitionLayout,
+    archive_offsets_path,
+    create_archive_offsets,
+    create_partition,
+    find_archive_offset,
+    open_partition_readonly,
+    partition_for,
+    read_gzip_member,
+    remove_partition_files,
+)
+from app.repositories.sqlite_write import WriteLockStats, WriteRetryPolicy, run_write_transaction
+import gzip
+import os
 import sqlite3
 
+# Rows streamed per fetchmany() when copying partitions (bounded memory)
+ARCHIVE_BATCH_SIZE = 500
+
+
+def build_list_item(conversation: InternalConversation) -> ConversationListItem:
+    """Compact list view of a conversation (counts + last message preview)."""
+    # Derive list preview from the last message (if any)
+    last_msg = conversation.messages[-1] if conversation.messages else None
+    last_message_at = last_msg.sent_at if last_msg else None
+
+    last_message_preview = None
+    if last_msg and last_msg.content is not None:
+        # Preview from the plain text extracted at ingest (rows stored before that fall back to raw content)
+        text = (last_msg.content_text if last_msg.content_text is not None else last_msg.content).strip()
+        last_message_preview = text[:120] if len(text) > 120 else text
+
+    return ConversationListItem(
+        id=conversation.id,
+        provider=conversation.provider,
+        external_id=conversation.external_id,
+        created_at=conversation.created_at,
+        updated_at=conversation.updated_at,
+        participant_count=len(conversation.participants),
+        message_count=len(conversation.messages),
+        last_message_at=last_message_at,
+        last_message_preview=last_message_preview,
+    )
+
 
 class ConversationRepository:
     """Persistence layer for normalized conversations.
 
-    For this take-home scope we store the *entire* normalized InternalConversation as JSON
-    in a single SQLite table. Dedup/idempotency is enforced via UNIQUE(provider, external_id).
+    For this take-home scope we store the *entire* normalized InternalConversation as JSON.
+    Storage is partitioned by ingestion month:
+    - the main DB (`db_path`) holds a small `conversation_index` (one row per conversation,
+      UNIQUE(provider, external_id) for dedup/idempotency) and the `partitions` catalog
+    - payloads live in monthly partition DBs next to it (`kbms.YYYY-MM.sqlite3`); a WAL
+      transaction is atomic per file only, so the payload is committed first and the
+      index row second (a crash in between leaves an unindexed payload, which reads ignore)
+    - cold partitions can be archived to gzipped JSONL (see app/services/archival.py);
+      their ids keep resolving through the index and are read back from the archive
+    - every insert also appends a compact list item to `conversation_events`, whose
+      AUTOINCREMENT `seq` is the durable event id used to resume SSE streams
+
+    Async handlers use the `*_async` methods, which run the blocking calls on the
+    repository's own read/write executors (see app/repositories/executor.py).
     """
 
-    def __init__(self, db_path: str = "kbms.sqlite3"):
+    def __init__(
+        self,
+        db_path: str = "kbms.sqlite3",
+        write_policy: Optional[WriteRetryPolicy] = None,
+        archive_dir: Optional[str] = None,
+        clock: Optional[Callable[[], datetime]] = None,
+        read_workers: int = 8,
+        write_workers: int = 2,
+        read_timeout: float = 5.0,
+        write_timeout: float = 15.0,
+    ):
         # SQLite file path (can be overridden in tests with a temp file)
         self.db_path = db_path
+        # Several uvicorn/gunicorn workers may write the same file: retry busy errors, don't 500
+        self.write_policy = write_policy or WriteRetryPolicy()
+        self.write_stats = WriteLockStats()
+        self.layout = PartitionLayout(db_path, archive_dir)
+        # Decides the partition new rows land in (overridable in tests)
+        self.clock = clock or (lambda: datetime.now(tz=timezone.utc))
+        self._ready_partitions: set[str] = set()
+        # SQLite serializes writers anyway: a couple of write threads is enough, and keeps
+        # ingest bursts from occupying the threads reads need.
+        # write_timeout should stay above the worst-case write_policy retry budget.
+        self.read_executor = RepositoryExecutor("read", read_workers, read_timeout)
+        self.write_executor = RepositoryExecutor("write", write_workers, write_timeout)
+
+    def _connect(self, attach: Optional[str] = None) -> sqlite3.Connection:
+        """Open a DB connection with Row access by column name.
 
-    def _connect(self) -> sqlite3.Connection:
-        """Open a DB connection with Row access by column name."""
+        `attach` names a partition to ATTACH as schema `part` (must happen outside a transaction).
+        """
         connection = sqlite3.connect(self.db_path)
         connection.row_factory = sqlite3.Row
+        if attach is not None:
+            connection.execute("ATTACH DATABASE ? AS part", (self.layout.partition_path(attach),))
         return connection
 
     def _init_db(self):
         """Create tables if they don't exist.
 
         Note: UNIQUE(provider, external_id) is the key constraint for basic idempotency.
+        WAL mode lets readers keep going while another process holds the write lock.
         """
         with self._connect() as connection:
+            # Only takes effect on a brand-new file (before any table exists)
+            connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            connection.execute("PRAGMA journal_mode=WAL")
             connection.execute(
                 """
-                 CREATE TABLE IF NOT EXISTS conversations (
+                CREATE TABLE IF NOT EXISTS conversation_index (
                   id TEXT PRIMARY KEY,
                   provider TEXT NOT NULL,
                   external_id TEXT NOT NULL,
                   created_at TEXT NOT NULL,
                   updated_at TEXT,
-                  payload_json TEXT NOT NULL,
+                  content_hash TEXT,
+                  partition TEXT NOT NULL,
                   UNIQUE(provider, external_id)
                 )
                 """
             )
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS partitions (
+                  name TEXT PRIMARY KEY,
+                  status TEXT NOT NULL,
+                  row_count INTEGER,
+                  archive_path TEXT,
+                  archived_at TEXT
+                )
+                """
+            )
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS conversation_events (
+                  seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                  conversation_id TEXT NOT NULL,
+                  partition TEXT NOT NULL,
+                  item_json TEXT NOT NULL
+                )
+                """
+            )
             connection.commit()
 
-    def upsert(self, conversation: InternalConversation) -> tuple[UUID, bool]:
+        self._migrate_legacy_table()
+        self._drop_index_rows_without_payload()
+
+    def _migrate_legacy_table(self):
+        """Move rows from the pre-partitioning single `conversations` table into partitions.
+
+        Legacy rows have no ingestion time, so they are partitioned by created_at month.
+        Each month moves in BEGIN IMMEDIATE transactions (safe if several workers start
+        at once): payloads are copied first, then indexed and removed from the legacy
+        table, so no index row ever commits before its payload. Then the freed pages are
+        handed back to the filesystem.
+        """
+        with self._connect() as connection:
+            if not self._has_legacy_table(connection):
+                return
+            months = [
+                row["month"]
+                for row in connection.execute("SELECT DISTINCT substr(created_at, 1, 7) AS month FROM conversations")
+            ]
+            # The baseline schema had no content_hash column
+            columns = {row["name"] for row in connection.execute("PRAGMA table_info(conversations)")}
+        content_hash_column = "content_hash" if "content_hash" in columns else "NULL"
+
+        for month in months:
+            self._ensure_partition(month)
+
+            def copy_payloads(connection: sqlite3.Connection, month: str = month) -> None:
+                if not self._has_legacy_table(connection):
+                    return  # another worker finished the migration
+                connection.execute(
+                    """
+                    INSERT OR IGNORE INTO part.conversations (id, created_at, payload_json)
+                    SELECT id, created_at, payload_json FROM main.conversations WHERE substr(created_at, 1, 7) = ?
+                    """,
+                    (month,),
+                )
+
+            def index_month(connection: sqlite3.Connection, month: str = month) -> None:
+                if not self._has_legacy_table(connection):
+                    return
+                connection.execute(
+                    f"""
+                    INSERT OR IGNORE INTO conversation_index
+                      (id, provider, external_id, created_at, updated_at, content_hash, partition)
+                    SELECT id, provider, external_id, created_at, updated_at, {content_hash_column}, ?
+                    FROM main.conversations WHERE substr(created_at, 1, 7) = ?
+                    """,
+                    (month, month),
+                )
+                connection.execute("DELETE FROM main.conversations WHERE substr(created_at, 1, 7) = ?", (month,))
+
+            # Two transactions, each writing one file: the partition, then the main DB
+            run_write_transaction(lambda: self._connect(attach=month), copy_payloads, self.write_policy, self.write_stats)
+            run_write_transaction(self._connect, index_month, self.write_policy, self.write_stats)
+
+        def drop_legacy(connection: sqlite3.Connection) -> None:
+            if self._has_legacy_table(connection):
+                connection.execute("DROP TABLE conversations")
+
+        run_write_transaction(self._connect, drop_legacy, self.write_policy, self.write_stats)
+
+        # Files created before partitioning have auto_vacuum=NONE; switching needs one full VACUUM
+        with self._connect() as connection:
+            if connection.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                connection.execute("VACUUM")
+        self.reclaim_space()
+
+    @staticmethod
+    def _has_legacy_table(connection: sqlite3.Connection) -> bool:
+        return connection.execute(
+            "SELECT 1 FROM main.sqlite_master WHERE type='table' AND name='conversations'"
+        ).fetchone() is not None
+
+    def _ensure_partition(self, name: str) -> None:
+        """Create partition `name` on disk and register it in the catalog (once per process)."""
+        if name in self._ready_partitions:
+            return
+
+        create_partition(self.layout.partition_path(name))
+
+        def register(connection: sqlite3.Connection) -> None:
+            connection.execute("INSERT OR IGNORE INTO partitions (name, status) VALUES (?, ?)", (name, ACTIVE))
+
+        run_write_transaction(self._connect, register, self.write_policy, self.write_stats)
+        self._ready_partitions.add(name)
+
+    def upsert(self, conversation: InternalConversation, content_hash: Optional[str] = None) -> tuple[UUID, bool]:
         """Insert conversation if not already present for (provider, external_id).
 
+        New conversations go to the partition of the current (ingestion) month.
+        `content_hash` is the hash of the raw provider body; it is persisted so the
+        in-memory dedup cache can be warmed up after a restart.
+
         Returns:
         - (existing_or_new_internal_id, deduplicated_flag)
+
+        Raises DatabaseBusyError if the write lock can't be acquired within `write_policy`.
         """
-        with self._connect() as connection:
-            # Check if we've already stored this provider conversation
+        internal_id, deduplicated, _ = self.upsert_with_event(conversation, content_hash)
+        return internal_id, deduplicated
+
+    def upsert_with_event(
+        self, conversation: InternalConversation, content_hash: Optional[str] = None
+    ) -> tuple[UUID, bool, Optional[ConversationEvent]]:
+        """Same as upsert(), also returning the ConversationEvent committed with a new row.
+
+        The event is None for deduplicated ingests (nothing new to announce).
+        """
+        partition = partition_for(self.clock())
+        self._ensure_partition(partition)
+
+        # Redeliveries are the common case: answer them without writing anything
+        existing_id = self._find_id(conversation.provider, conversation.external_id)
+        if existing_id is not None:
+            return existing_id, True, None
+
+        # 1) Payload in its own transaction: once the index row below commits, the payload
+        #    is already durable, even if the process dies in between
+        self._write_payload(partition, conversation)
+
+        def insert_if_absent(connection: sqlite3.Connection) -> tuple[UUID, bool, Optional[ConversationEvent]]:
+            # Check again under the write lock: another worker may have won the race
             row = connection.execute(
-                "SELECT id FROM conversations WHERE provider=? AND external_id=?",
+                "SELECT id FROM conversation_index WHERE provider=? AND external_id=?",
                 (conversation.provider, conversation.external_id),
             ).fetchone()
 
             if row:
                 # Already exists => deduplicated ingestion
-                return UUID(row["id"]), True
+                return UUID(row["id"]), True, None
 
-            # New record => store normalized internal JSON
             connection.execute(
                 """
-                INSERT INTO conversations (id, provider, external_id, created_at, updated_at, payload_json)
-                VALUES (?, ?, ?, ?, ?, ?)
+                INSERT INTO conversation_index (id, provider, external_id, created_at, updated_at, content_hash, partition)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     str(conversation.id),
@@ -72,61 +303,480 @@ class ConversationRepository:
                     conversation.external_id,
                     conversation.created_at.isoformat(),
                     conversation.updated_at.isoformat() if conversation.updated_at else None,
-                    conversation.model_dump_json(),
+                    content_hash,
+                    partition,
                 ),
             )
-            connection.commit()
-            return conversation.id, False
+
+            # Event log row in the same transaction: an event exists iff the conversation does
+            item = build_list_item(conversation)
+            cursor = connection.execute(
+                "INSERT INTO conversation_events (conversation_id, partition, item_json) VALUES (?, ?, ?)",
+                (str(conversation.id), partition, item.model_dump_json()),
+            )
+            return conversation.id, False, ConversationEvent(seq=cursor.lastrowid, item=item)
+
+        # 2) SELECT + INSERTs under one BEGIN IMMEDIATE so concurrent workers can't both insert
+        indexed = False
+        try:
+            result = run_write_transaction(self._connect, insert_if_absent, self.write_policy, self.write_stats)
+            indexed = not result[1]
+            return result
+        finally:
+            if not indexed:
+                # Lost the race (or the index write failed): our payload is unreachable
+                self._delete_payload(partition, conversation.id)
+
+    def _find_id(self, provider: str, external_id: str) -> Optional[UUID]:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT id FROM conversation_index WHERE provider=? AND external_id=?", (provider, external_id)
+            ).fetchone()
+        return UUID(row["id"]) if row else None
+
+    def _write_payload(self, partition: str, conversation: InternalConversation) -> None:
+        def insert(connection: sqlite3.Connection) -> None:
+            connection.execute(
+                "INSERT INTO conversations (id, created_at, payload_json) VALUES (?, ?, ?)",
+                (str(conversation.id), conversation.created_at.isoformat(), conversation.model_dump_json()),
+            )
+
+        path = self.layout.partition_path(partition)
+        run_write_transaction(lambda: sqlite3.connect(path), insert, self.write_policy, self.write_stats)
+
+    def _delete_payload(self, partition: str, conversation_id: UUID) -> None:
+        def delete(connection: sqlite3.Connection) -> None:
+            connection.execute("DELETE FROM conversations WHERE id=?", (str(conversation_id),))
+
+        path = self.layout.partition_path(partition)
+        run_write_transaction(lambda: sqlite3.connect(path), delete, self.write_policy, self.write_stats)
+
+    def _drop_index_rows_without_payload(self) -> int:
+        """Delete index (and event) rows of active partitions whose payload is missing.
+
+        Before payloads were committed on their own, index and payload shared one
+        transaction over two WAL files, which is not atomic across files: a crash could
+        commit the index row alone, and every redelivery would then dedup to an id that
+        404s. Runs at startup in short batches. Returns the number of rows removed.
+        """
+        def check_batch(connection: sqlite3.Connection, after: int) -> tuple[Optional[int], int]:
+            # Payloads are committed before their index row, so every index row visible
+            # under this write lock has its payload visible to the reads below
+            records = connection.execute(
+                """
+                SELECT i.rowid AS position, i.id, i.partition
+                FROM conversation_index i JOIN partitions p ON p.name = i.partition
+                WHERE i.rowid > ? AND p.status = ?
+                ORDER BY i.rowid LIMIT ?
+                """,
+                (after, ACTIVE, ARCHIVE_BATCH_SIZE),
+            ).fetchall()
+
+            ids_by_partition: dict[str, List[str]] = {}
+            for record in records:
+                ids_by_partition.setdefault(record["partition"], []).append(record["id"])
+
+            missing: List[str] = []
+            for name, ids in ids_by_partition.items():
+                path = self.layout.partition_path(name)
+                if not os.path.exists(path):
+                    continue  # a lost partition file is not repaired here (reads fail loudly)
+                partition = open_partition_readonly(path)
+                try:
+                    placeholders = ",".join("?" * len(ids))
+                    present = {
+                        row["id"]
+                        for row in partition.execute(f"SELECT id FROM conversations WHERE id IN ({placeholders})", ids)
+                    }
+                finally:
+                    partition.close()
+                missing.extend(id_ for id_ in ids if id_ not in present)
+
+            if missing:
+                placeholders = ",".join("?" * len(missing))
+                connection.execute(f"DELETE FROM conversation_events WHERE conversation_id IN ({placeholders})", missing)
+                connection.execute(f"DELETE FROM conversation_index WHERE id IN ({placeholders})", missing)
+            next_after = records[-1]["position"] if len(records) == ARCHIVE_BATCH_SIZE else None
+            return next_after, len(missing)
+
+        removed = 0
+        after: Optional[int] = 0
+        while after is not None:
+            after, count = run_write_transaction(
+                self._connect, partial(check_batch, after=after), self.write_policy, self.write_stats
+            )
+            removed += count
+        return removed
+
+    async def build_and_upsert_async(
+        self, build: Callable[[], InternalConversation], content_hash: Optional[str] = None
+    ) -> tuple[InternalConversation, tuple[UUID, bool, Optional[ConversationEvent]]]:
+        """Call `build()` (e.g. a provider mapper) and upsert_with_event() its result, on the write executor.
+
+        Mapping can be CPU-heavy (HTML -> text), so it runs off the event loop with the write.
+        """
+        return await self.write_executor.run(self._build_and_upsert, build, content_hash)
+
+    def _build_and_upsert(
+        self, build: Callable[[], InternalConversation], content_hash: Optional[str]
+    ) -> tuple[InternalConversation, tuple[UUID, bool, Optional[ConversationEvent]]]:
+        conversation = build()
+        return conversation, self.upsert_with_event(conversation, content_hash)
+
+    async def list_conversations_async(self) -> ConversationListResponse:
+        return await self.read_executor.run(self.list_conversations)
+
+    async def get_conversation_async(self, conversation_id: UUID) -> Optional[InternalConversation]:
+        return await self.read_executor.run(self.get_conversation, conversation_id)
+
+    async def events_since_async(self, seq: int, limit: int) -> List[ConversationEvent]:
+        return await self.read_executor.run(self.events_since, seq, limit)
+
+    async def latest_event_seq_async(self) -> int:
+        return await self.read_executor.run(self.latest_event_seq)
+
+    async def latest_position_async(self) -> int:
+        return await self.read_executor.run(self.latest_position)
+
+    def close(self) -> None:
+        """Stop the executors (waits for in-flight operations)."""
+        self.read_executor.shutdown()
+        self.write_executor.shutdown()
 
     def list_conversations(self) -> ConversationListResponse:
         """Return a stable list view for internal consumers.
 
+        Only active (non-archived) partitions are read.
         We compute list-only fields (counts + last_message preview) from the stored JSON.
         """
-        items = []
+        conversations = []
+        for name in self.partitions(status=ACTIVE):
+            try:
+                connection = open_partition_readonly(self.layout.partition_path(name))
+                try:
+                    records = connection.execute("SELECT id, payload_json FROM conversations").fetchall()
+                finally:
+                    connection.close()
+            except sqlite3.OperationalError:
+                if self._is_archived(name):
+                    continue  # archived (and removed) between the catalog read and now
+                raise
+
+            # Payloads whose index row never committed (crash, lost dedup race) are not visible
+            indexed = self._indexed_ids(name)
+            # Re-hydrate normalized conversations from JSON
+            conversations.extend(
+                InternalConversation.model_validate_json(r["payload_json"]) for r in records if r["id"] in indexed
+            )
+
+        conversations.sort(key=lambda c: c.created_at, reverse=True)
+
+        return ConversationListResponse(items=[build_list_item(conversation) for conversation in conversations])
+
+    def _indexed_ids(self, partition: str) -> set[str]:
+        with self._connect() as connection:
+            return {
+                row["id"]
+                for row in connection.execute("SELECT id FROM conversation_index WHERE partition=?", (partition,))
+            }
+
+    def events_since(self, seq: int, limit: int) -> List[ConversationEvent]:
+        """Up to `limit` events with seq > `seq`, in seq order (for Last-Event-ID resume)."""
+        with self._connect() as connection:
+            records = connection.execute(
+                "SELECT seq, item_json FROM conversation_events WHERE seq > ? ORDER BY seq LIMIT ?",
+                (seq, limit),
+            ).fetchall()
+
+        return [
+            ConversationEvent(seq=record["seq"], item=ConversationListItem.model_validate_json(record["item_json"]))
+            for record in records
+        ]
+
+    def conversations_after(
+        self,
+        cursor: int,
+        limit: int,
+        updated_since: Optional[datetime] = None,
+        upto: Optional[int] = None,
+    ) -> tuple[List[InternalConversation], Optional[int]]:
+        """One keyset page of active conversations, in index (ingestion) order.
+
+        Start with cursor=0 (or a previous export's watermark) and pass the returned
+        cursor back until it is None. Each call holds at most `limit` conversations in
+        memory, so bulk exports stay bounded. `upto` (from latest_position()) stops at
+        a fixed snapshot. `updated_since` is only a filter: it keeps conversations
+        whose updated_at (or created_at when there is none) is >= it; naive datetimes
+        are taken as UTC. Archived partitions are skipped (their JSONL.gz archives
+        already are a bulk snapshot).
+        """
+        since = None
+        if updated_since is not None:
+            if updated_since.tzinfo is None:
+                updated_since = updated_since.replace(tzinfo=timezone.utc)
+            # Stored timestamps are UTC isoformat strings, so they compare correctly as text
+            since = updated_since.astimezone(timezone.utc).isoformat()
+
         with self._connect() as connection:
             records = connection.execute(
-                "SELECT payload_json FROM conversations ORDER BY created_at DESC"
+                """
+                SELECT i.rowid AS position, i.id, i.partition
+                FROM conversation_index i JOIN partitions p ON p.name = i.partition
+                WHERE i.rowid > ? AND (? IS NULL OR i.rowid <= ?) AND p.status = ?
+                  AND (? IS NULL OR COALESCE(i.updated_at, i.created_at) >= ?)
+                ORDER BY i.rowid LIMIT ?
+                """,
+                (cursor, upto, upto, ACTIVE, since, since, limit),
             ).fetchall()
+        if not records:
+            return [], None
 
+        ids_by_partition: dict[str, List[str]] = {}
         for record in records:
-            # Re-hydrate normalized conversation from JSON
-            conversation = InternalConversation.model_validate_json(record["payload_json"])
-
-            # Derive list preview from the last message (if any)
-            last_msg = conversation.messages[-1] if conversation.messages else None
-            last_message_at = last_msg.sent_at if last_msg else None
-
-            last_message_preview = None
-            if last_msg and last_msg.content is not None:
-                text = last_msg.content.strip()
-                last_message_preview = text[:120] if len(text) > 120 else text
-
-            items.append(
-                ConversationListItem(
-                    id=conversation.id,
-                    provider=conversation.provider,
-                    external_id=conversation.external_id,
-                    created_at=conversation.created_at,
-                    updated_at=conversation.updated_at,
-                    participant_count=len(conversation.participants),
-                    message_count=len(conversation.messages),
-                    last_message_at=last_message_at,
-                    last_message_preview=last_message_preview,
-                )
-            )
+            ids_by_partition.setdefault(record["partition"], []).append(record["id"])
+
+        payloads: dict[str, str] = {}
+        for name, ids in ids_by_partition.items():
+            try:
+                connection = open_partition_readonly(self.layout.partition_path(name))
+                try:
+                    placeholders = ",".join("?" * len(ids))
+                    payloads.update(
+                        (row["id"], row["payload_json"])
+                        for row in connection.execute(
+                            f"SELECT id, payload_json FROM conversations WHERE id IN ({placeholders})", ids
+                        )
+                    )
+                finally:
+                    connection.close()
+            except sqlite3.OperationalError:
+                if self._is_archived(name):
+                    continue  # archived (and removed) between the index read and now
+                raise
+
+        conversations = [
+            InternalConversation.model_validate_json(payloads[record["id"]])
+            for record in records
+            if record["id"] in payloads
+        ]
+        next_cursor = records[-1]["position"] if len(records) == limit else None
+        return conversations, next_cursor
 
-        return ConversationListResponse(items=items)
+    def latest_position(self) -> int:
+        """Index position of the last ingested conversation (0 if none).
+
+        Index rows are never deleted (short of the startup repair of rows whose payload
+        was lost) and writers are serialized, so positions grow in commit order: everything ingested after this call gets a higher one, whatever
+        its provider timestamps. Used as the bulk-export watermark.
+        """
+        with self._connect() as connection:
+            return connection.execute("SELECT COALESCE(MAX(rowid), 0) FROM conversation_index").fetchone()[0]
+
+    def latest_event_seq(self) -> int:
+        """Highest committed event seq (0 if none): where a stream without Last-Event-ID starts."""
+        with self._connect() as connection:
+            return connection.execute("SELECT COALESCE(MAX(seq), 0) FROM conversation_events").fetchone()[0]
 
     def get_conversation(self, conversation_id: UUID) -> Optional[InternalConversation]:
         """Fetch one conversation by internal UUID.
 
+        Conversations in archived partitions are read back from the archive file.
         Returns None if not found (router maps this to a 404 ErrorResponse).
         """
+        location = self._locate(conversation_id)
+        if location is None:
+            return None
+
+        if location["status"] == ACTIVE:
+            try:
+                connection = open_partition_readonly(self.layout.partition_path(location["partition"]))
+                try:
+                    record = connection.execute(
+                        "SELECT payload_json FROM conversations WHERE id=?", (str(conversation_id),)
+                    ).fetchone()
+                finally:
+                    connection.close()
+            except sqlite3.OperationalError:
+                # The archival job may have moved the partition since _locate(): look again
+                location = self._locate(conversation_id)
+                if location is None or location["status"] != ARCHIVED:
+                    raise
+            else:
+                return InternalConversation.model_validate_json(record["payload_json"]) if record else None
+
+        return self._read_archived(location["archive_path"], conversation_id)
+
+    def _locate(self, conversation_id: UUID) -> Optional[sqlite3.Row]:
         with self._connect() as connection:
-            record = connection.execute("SELECT payload_json FROM conversations WHERE id=?", (str(conversation_id),),).fetchone()
+            return connection.execute(
+                """
+                SELECT i.partition, p.status, p.archive_path
+                FROM conversation_index i JOIN partitions p ON p.name = i.partition
+                WHERE i.id = ?
+                """,
+                (str(conversation_id),),
+            ).fetchone()
+
+    def _is_archived(self, name: str) -> bool:
+        """Whether partition `name` is archived now.
+
+        Used after a failed partition read: only the archival race (catalog flipped,
+        file deleted) is skipped; any other error on an active partition is raised.
+        """
+        with self._connect() as connection:
+            record = connection.execute("SELECT status FROM partitions WHERE name=?", (name,)).fetchone()
+        return record is not None and record["status"] == ARCHIVED
+
+    @staticmethod
+    def _read_archived(archive_path: str, conversation_id: UUID) -> Optional[InternalConversation]:
+        """Read one conversation back from a monthly archive (cold path).
+
+        The sidecar gives the offset of the gzip member (one archive batch) holding the
+        id, so only that member is decompressed. Archives written before sidecars
+        existed fall back to a linear scan (the id check avoids parsing most lines).
+        """
+        needle = str(conversation_id)
+        offsets_path = archive_offsets_path(archive_path)
+        if not os.path.exists(offsets_path):
+            with gzip.open(archive_path, "rt", encoding="utf-8") as archive:
+                return ConversationRepository._find_in_lines(archive, conversation_id)
+
+        offset = find_archive_offset(offsets_path, needle)
+        if offset is None:
+            return None
+        with open(archive_path, "rb") as archive:
+            member = read_gzip_member(archive, offset).decode("utf-8")
+        return ConversationRepository._find_in_lines(member.splitlines(), conversation_id)
+
+    @staticmethod
+    def _find_in_lines(lines: Iterable[str], conversation_id: UUID) -> Optional[InternalConversation]:
+        needle = str(conversation_id)
+        for line in lines:
+            if needle in line:
+                conversation = InternalConversation.model_validate_json(line)
+                if conversation.id == conversation_id:
+                    return conversation
+        return None
+
+    def recent_dedup_entries(self, limit: int) -> List[tuple[tuple[str, str, Optional[str]], str, UUID]]:
+        """Return up to `limit` most recently inserted content hashes, oldest first.
+
+        Each entry is ((provider, external_id, updated_at), content_hash, internal_id);
+        used to warm up the dedup front-cache at startup (see DedupCache.warm_up).
+        """
+        with self._connect() as connection:
+            records = connection.execute(
+                """
+                SELECT id, provider, external_id, updated_at, content_hash FROM conversation_index
+                WHERE content_hash IS NOT NULL
+                ORDER BY rowid DESC LIMIT ?
+                """,
+                (limit,),
+            ).fetchall()
 
-            if not record:
-                return None
+        return [
+            ((record["provider"], record["external_id"], record["updated_at"]), record["content_hash"], UUID(record["id"]))
+            for record in reversed(records)
+        ]
+
+    def partitions(self, status: Optional[str] = None) -> List[str]:
+        """Partition names (oldest first), optionally filtered by status."""
+        with self._connect() as connection:
+            if status is None:
+                records = connection.execute("SELECT name FROM partitions ORDER BY name").fetchall()
+            else:
+                records = connection.execute(
+                    "SELECT name FROM partitions WHERE status=? ORDER BY name", (status,)
+                ).fetchall()
+        return [record["name"] for record in records]
+
+    def current_partition(self) -> str:
+        return partition_for(self.clock())
+
+    def archive_partition(self, name: str) -> int:
+        """Move one partition to `<archive_dir>/<stem>.<name>.jsonl.gz` and delete its DB file.
+
+        Ingestion only ever writes the current month, so archiving an older partition
+        never contends with ingest writes. The only main-DB write is the catalog
+        status flip, which is one short transaction. Returns the number of archived rows.
+        """
+        if name == self.current_partition():
+            raise ValueError(f"Refusing to archive the current partition {name}")
+
+        partition_path = self.layout.partition_path(name)
+        archive_path = self.layout.archive_path(name)
+        os.makedirs(self.layout.archive_dir, exist_ok=True)
+
+        # 1) Stream rows to temp files in fixed-size batches (one gzip member per batch, its
+        #    offset recorded per id in the sidecar), then atomically publish both
+        tmp_path = archive_path + ".tmp"
+        offsets_path = archive_offsets_path(archive_path)
+        tmp_offsets_path = offsets_path + ".tmp"
+        if os.path.exists(tmp_offsets_path):
+            os.remove(tmp_offsets_path)  # left over by an interrupted run
+        row_count = 0
+        connection = open_partition_readonly(partition_path)
+        offsets = create_archive_offsets(tmp_offsets_path)
+        try:
+            cursor = connection.execute("SELECT id, payload_json FROM conversations ORDER BY rowid")
+            with open(tmp_path, "wb") as archive:
+                while True:
+                    records = cursor.fetchmany(ARCHIVE_BATCH_SIZE)
+                    if not records:
+                        break
+                    member_offset = archive.tell()
+                    lines = "".join(record["payload_json"] + "\n" for record in records)
+                    archive.write(gzip.compress(lines.encode("utf-8"), mtime=0))
+                    offsets.executemany(
+                        "INSERT INTO offsets (id, member_offset) VALUES (?, ?)",
+                        ((record["id"], member_offset) for record in records),
+                    )
+                    row_count += len(records)
+                archive.flush()
+                os.fsync(archive.fileno())
+            offsets.commit()
+        finally:
+            offsets.close()
+            connection.close()
+        os.replace(tmp_offsets_path, offsets_path)
+        os.replace(tmp_path, archive_path)
+
+        # 2) Flip the catalog: from now on reads of these ids go to the archive
+        def mark_archived(connection: sqlite3.Connection) -> None:
+            connection.execute(
+                """
+                UPDATE partitions SET status=?, row_count=?, archive_path=?, archived_at=?
+                WHERE name=? AND status=?
+                """,
+                (ARCHIVED, row_count, archive_path, datetime.now(tz=timezone.utc).isoformat(), name, ACTIVE),
+            )
+            # Stream consumers resuming from this far back get a gap, like with any retention window
+            connection.execute("DELETE FROM conversation_events WHERE partition=?", (name,))
+
+        run_write_transaction(self._connect, mark_archived, self.write_policy, self.write_stats)
+
+        # 3) The partition is a whole file: dropping it returns all of its space at once
+        remove_partition_files(partition_path)
+        self._ready_partitions.discard(name)
+        return row_count
+
+    def reclaim_space(self, pages_per_step: int = 256) -> int:
+        """Return free pages of the main DB to the filesystem via incremental vacuum.
+
+        Runs in small steps (one short write transaction each) so ingestion can interleave.
+        Returns the number of pages released.
+        """
+        released = 0
+        while True:
+            def step(connection: sqlite3.Connection) -> int:
+                before = connection.execute("PRAGMA freelist_count").fetchone()[0]
+                if before == 0:
+                    return 0
+                # fetchall(): the pragma frees one page per step of the statement
+                connection.execute(f"PRAGMA incremental_vacuum({int(pages_per_step)})").fetchall()
+                return before - connection.execute("PRAGMA freelist_count").fetchone()[0]
 
-            return InternalConversation.model_validate_json(record["payload_json"])
+            freed = run_write_transaction(self._connect, step, self.write_policy, self.write_stats)
+            if freed <= 0:
+                return released
+            released += freed
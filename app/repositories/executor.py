@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class RepositoryTimeoutError(Exception):
+    """Raised when a repository operation did not finish within its timeout.
+
+    The API maps this to 503 + Retry-After (see app/core/error_handlers.py).
+    """
+
+
+class _Call:
+    """Book-keeping for one submitted operation."""
+
+    __slots__ = ("submitted_at", "started", "abandoned")
+
+    def __init__(self):
+        self.submitted_at = time.perf_counter()
+        self.started = False
+        self.abandoned = False
+
+
+class RepositoryExecutor:
+    """Dedicated, sized thread pool for blocking SQLite calls made from async handlers.
+
+    Reads and writes get separate instances so a burst of slow ingest writes can't
+    take the threads that light reads need (and none of them use Starlette's
+    shared default threadpool). Every call has a timeout. A call that times out,
+    or whose caller is cancelled, while still queued is dropped when a worker picks
+    it up, instead of doing work nobody is waiting for.
+    """
+
+    def __init__(self, name: str, max_workers: int, timeout: float):
+        self.name = name
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"repo-{name}")
+        self._lock = threading.Lock()
+
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.timeouts = 0
+        self.dropped = 0
+        self.queue_wait_total_s = 0.0
+        self.queue_wait_max_s = 0.0
+
+    async def run(self, fn: Callable[..., T], *args: Any, timeout: Optional[float] = None) -> T:
+        """Run `fn(*args)` on this executor; raise RepositoryTimeoutError after `timeout` seconds."""
+        call = _Call()
+        with self._lock:
+            self.queued += 1
+
+        future = asyncio.get_running_loop().run_in_executor(self._pool, self._execute, call, fn, args)
+        try:
+            return await asyncio.wait_for(future, timeout if timeout is not None else self.timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise RepositoryTimeoutError(f"{self.name} operation {getattr(fn, '__name__', fn)} timed out")
+        finally:
+            # Timed out, or the awaiting task was cancelled (client disconnect, stream teardown)
+            with self._lock:
+                if not call.started:
+                    # Still queued: the worker will skip it (or it was cancelled outright)
+                    call.abandoned = True
+                    self.queued -= 1
+                    self.dropped += 1
+
+    def _execute(self, call: _Call, fn: Callable[..., T], args: tuple) -> Optional[T]:
+        waited = time.perf_counter() - call.submitted_at
+        with self._lock:
+            call.started = True
+            if call.abandoned:
+                return None  # already counted as dropped when it timed out
+            self.queued -= 1
+            self.queue_wait_total_s += waited
+            self.queue_wait_max_s = max(self.queue_wait_max_s, waited)
+            self.active += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            started = self.completed + self.active
+            return {
+                "max_workers": self.max_workers,
+                "queued": self.queued,
+                "active": self.active,
+                "completed": self.completed,
+                "timeouts": self.timeouts,
+                "dropped": self.dropped,
+                "queue_wait_avg_ms": (self.queue_wait_total_s / started * 1e3) if started else 0.0,
+                "queue_wait_max_ms": self.queue_wait_max_s * 1e3,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,125 @@
+import os
+import sqlite3
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+# Partition status values stored in the main DB `partitions` table
+ACTIVE = "active"
+ARCHIVED = "archived"
+
+
+def partition_for(moment: datetime) -> str:
+    """Monthly partition name ("YYYY-MM") for an ingestion timestamp."""
+    return moment.strftime("%Y-%m")
+
+
+def months_before(name: str, months: int) -> str:
+    """Partition name `months` months before `name` ("2024-03", 2 -> "2024-01")."""
+    year, month = (int(x) for x in name.split("-"))
+    index = year * 12 + (month - 1) - months
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+class PartitionLayout:
+    """Where partition databases and archive files live on disk.
+
+    Given `kbms.sqlite3`, the 2024-03 partition is `kbms.2024-03.sqlite3` next to it
+    and its archive is `<archive_dir>/kbms.2024-03.jsonl.gz`, with the id -> offset
+    sidecar `<archive_dir>/kbms.2024-03.offsets.sqlite3`.
+    """
+
+    def __init__(self, db_path: str, archive_dir: Optional[str] = None):
+        path = Path(db_path)
+        self.directory = path.parent
+        self.stem = path.stem
+        self.archive_dir = Path(archive_dir) if archive_dir else self.directory / "archive"
+
+    def partition_path(self, name: str) -> str:
+        return str(self.directory / f"{self.stem}.{name}.sqlite3")
+
+    def archive_path(self, name: str) -> str:
+        return str(self.archive_dir / f"{self.stem}.{name}.jsonl.gz")
+
+
+def archive_offsets_path(archive_path: str) -> str:
+    """Sidecar of an archive file (derived from the path stored in the catalog)."""
+    return archive_path.removesuffix(".jsonl.gz") + ".offsets.sqlite3"
+
+
+def create_archive_offsets(path: str) -> sqlite3.Connection:
+    """Create an archive sidecar: conversation id -> byte offset of the gzip member holding it.
+
+    Archives are written as one gzip member per batch of rows (still a valid .jsonl.gz),
+    so one id is read back by decompressing a single member, not the whole month.
+    """
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE offsets (id TEXT PRIMARY KEY, member_offset INTEGER NOT NULL) WITHOUT ROWID")
+    return connection
+
+
+def find_archive_offset(path: str, conversation_id: str) -> Optional[int]:
+    """Member offset of `conversation_id` from an archive sidecar (None if it is not archived there)."""
+    connection = sqlite3.connect(Path(path).resolve().as_uri() + "?mode=ro", uri=True)
+    try:
+        row = connection.execute("SELECT member_offset FROM offsets WHERE id=?", (conversation_id,)).fetchone()
+    finally:
+        connection.close()
+    return row[0] if row else None
+
+
+def read_gzip_member(archive: BinaryIO, offset: int, chunk_size: int = 64 * 1024) -> bytes:
+    """Decompress the single gzip member starting at byte `offset` of `archive`."""
+    archive.seek(offset)
+    decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)  # gzip framing, stops at the member's end
+    chunks = []
+    while not decompressor.eof:
+        data = archive.read(chunk_size)
+        if not data:
+            raise EOFError(f"Truncated gzip member at offset {offset}")
+        chunks.append(decompressor.decompress(data))
+    return b"".join(chunks)
+
+
+def create_partition(path: str) -> None:
+    """Create a partition database (idempotent).
+
+    auto_vacuum must be chosen before the first table exists, so it is set here.
+    """
+    connection = sqlite3.connect(path, timeout=5.0)
+    try:
+        connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS conversations (
+              id TEXT PRIMARY KEY,
+              created_at TEXT NOT NULL,
+              payload_json TEXT NOT NULL
+            )
+            """
+        )
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def open_partition_readonly(path: str) -> sqlite3.Connection:
+    """Open an existing partition for reading.
+
+    Read-only URI mode never creates the file, so a reader racing the archival job
+    gets an OperationalError instead of silently resurrecting an empty partition.
+    """
+    connection = sqlite3.connect(Path(path).resolve().as_uri() + "?mode=ro", uri=True)
+    connection.row_factory = sqlite3.Row
+    return connection
+
+
+def remove_partition_files(path: str) -> None:
+    """Delete a partition database together with its WAL/SHM side files."""
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,133 @@
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class DatabaseBusyError(Exception):
+    """Raised when a write could not acquire the SQLite write lock within the retry budget.
+
+    The API maps this to 503 + Retry-After (see app/core/error_handlers.py) instead of a 500.
+    """
+
+
+def is_busy_error(exc: sqlite3.OperationalError) -> bool:
+    """True for SQLITE_BUSY / SQLITE_LOCKED ("database is locked", "database table is locked")."""
+    code = getattr(exc, "sqlite_errorcode", None)
+    if code is not None:
+        # Extended codes keep the primary code in the low byte
+        return (code & 0xFF) in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    message = str(exc).lower()
+    return "locked" in message or "busy" in message
+
+
+@dataclass(frozen=True)
+class WriteRetryPolicy:
+    """How hard a write tries before giving up with DatabaseBusyError.
+
+    Each attempt waits up to `busy_timeout` seconds inside SQLite's own busy handler,
+    then sleeps a jittered exponential backoff (capped at `max_delay`) before retrying.
+    """
+
+    max_attempts: int = 8
+    busy_timeout: float = 1.0
+    base_delay: float = 0.01
+    max_delay: float = 0.5
+
+    def backoff(self, attempt: int) -> float:
+        # "Full jitter": spreads retrying workers out instead of having them collide again
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class WriteLockStats:
+    """Per-process counters for the write path (lock wait time, retries, give-ups)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.transactions = 0
+        self.busy_retries = 0
+        self.busy_failures = 0
+        self.lock_wait_total_s = 0.0
+        self.lock_wait_max_s = 0.0
+
+    def record_transaction(self, lock_wait_s: float, retries: int) -> None:
+        with self._lock:
+            self.transactions += 1
+            self.busy_retries += retries
+            self.lock_wait_total_s += lock_wait_s
+            self.lock_wait_max_s = max(self.lock_wait_max_s, lock_wait_s)
+
+    def record_failure(self, lock_wait_s: float, retries: int) -> None:
+        with self._lock:
+            self.busy_failures += 1
+            self.busy_retries += retries
+            self.lock_wait_total_s += lock_wait_s
+            self.lock_wait_max_s = max(self.lock_wait_max_s, lock_wait_s)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            attempts = self.transactions + self.busy_failures
+            return {
+                "transactions": self.transactions,
+                "busy_retries": self.busy_retries,
+                "busy_failures": self.busy_failures,
+                "lock_wait_avg_ms": (self.lock_wait_total_s / attempts * 1e3) if attempts else 0.0,
+                "lock_wait_max_ms": self.lock_wait_max_s * 1e3,
+            }
+
+
+def run_write_transaction(
+    connect: Callable[[], sqlite3.Connection],
+    work: Callable[[sqlite3.Connection], T],
+    policy: WriteRetryPolicy,
+    stats: WriteLockStats,
+) -> T:
+    """Run `work(connection)` inside BEGIN IMMEDIATE, retrying the whole unit on busy errors.
+
+    BEGIN IMMEDIATE takes the write lock up front, so the read-then-write in `work`
+    can never hit the deferred-transaction upgrade deadlock (which fails with
+    SQLITE_BUSY immediately, bypassing the busy timeout). Any busy error, from
+    BEGIN, a statement or COMMIT, rolls back and retries the whole unit.
+    """
+    lock_wait = 0.0
+    for attempt in range(policy.max_attempts):
+        connection = connect()
+        # Autocommit mode: we issue BEGIN/COMMIT ourselves
+        connection.isolation_level = None
+        connection.execute(f"PRAGMA busy_timeout = {int(policy.busy_timeout * 1000)}")
+        try:
+            started = time.perf_counter()
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+            finally:
+                lock_wait += time.perf_counter() - started
+
+            try:
+                result = work(connection)
+                connection.execute("COMMIT")
+            except BaseException:
+                # SQLite may already have rolled back on its own (e.g. after SQLITE_BUSY on COMMIT)
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                raise
+
+            stats.record_transaction(lock_wait, retries=attempt)
+            return result
+        except sqlite3.OperationalError as exc:
+            if not is_busy_error(exc):
+                raise
+            if attempt + 1 < policy.max_attempts:
+                delay = policy.backoff(attempt)
+                time.sleep(delay)
+                lock_wait += delay
+        finally:
+            connection.close()
+
+    stats.record_failure(lock_wait, retries=policy.max_attempts - 1)
+    raise DatabaseBusyError(
+        f"SQLite write lock not acquired after {policy.max_attempts} attempts ({lock_wait:.2f}s)"
+    )
@@ -0,0 +1,58 @@
+"""Retention job: archive cold monthly partitions to gzipped JSONL.
+
+Run it out of band (cron / a one-off container) against the same database the
+service uses; it never writes the current ingestion partition, so it does not
+block ingestion:
+
+    python -m app.services.archival --db-path kbms.sqlite3 --retention-months 3
+"""
+import argparse
+from typing import Dict, List, Optional
+
+from app.repositories.conversations import ConversationRepository
+from app.repositories.partitions import ACTIVE, months_before
+
+
+class ArchivalJob:
+    """Archives every active partition older than `retention_months` full months.
+
+    With retention_months=3 and a current partition of 2024-06, partitions up to
+    and including 2024-02 are archived; 2024-03..2024-06 stay hot.
+    """
+
+    def __init__(self, repo: ConversationRepository, retention_months: int = 3):
+        if retention_months < 1:
+            raise ValueError("retention_months must be >= 1 (the current partition is always hot)")
+        self.repo = repo
+        self.retention_months = retention_months
+
+    def cold_partitions(self) -> List[str]:
+        cutoff = months_before(self.repo.current_partition(), self.retention_months)
+        return [name for name in self.repo.partitions(status=ACTIVE) if name < cutoff]
+
+    def run(self) -> Dict[str, int]:
+        """Archive all cold partitions, then reclaim free pages. Returns rows archived per partition."""
+        archived = {name: self.repo.archive_partition(name) for name in self.cold_partitions()}
+        self.repo.reclaim_space()
+        return archived
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Archive cold conversation partitions")
+    parser.add_argument("--db-path", default="kbms.sqlite3")
+    parser.add_argument("--archive-dir", default=None, help="defaults to <db dir>/archive")
+    parser.add_argument("--retention-months", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    repo = ConversationRepository(db_path=args.db_path, archive_dir=args.archive_dir)
+    repo._init_db()
+    archived = ArchivalJob(repo, args.retention_months).run()
+
+    if not archived:
+        print("No partitions to archive")
+    for name, rows in archived.items():
+        print(f"Archived {name}: {rows} conversations -> {repo.layout.archive_path(name)}")
+
+
+if __name__ == "__main__":
+    main()
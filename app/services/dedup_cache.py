@@ -0,0 +1,113 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+
+# (provider, external_id, updated_at isoformat) identifies one delivered revision of a conversation
+DedupKey = Tuple[str, str, Optional[str]]
+
+
+def content_hash(body: bytes) -> str:
+    """Stable hash of a raw request body (exact-redelivery fingerprint)."""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+@dataclass(frozen=True)
+class DedupEntry:
+    key: DedupKey
+    content_hash: str
+    internal_id: UUID
+
+    @property
+    def provider(self) -> str:
+        return self.key[0]
+
+    @property
+    def external_id(self) -> str:
+        return self.key[1]
+
+
+class DedupCache:
+    """Bounded in-memory front-cache of recently ingested webhook bodies.
+
+    Providers (Intercom especially) retry and redeliver the exact same body. Without
+    this cache every redelivery pays validation + mapping + a SQLite round trip just
+    to learn it is a duplicate.
+
+    Entries are keyed by (provider, external_id, updated_at) and remember the content
+    hash of the raw body plus the internal id it was stored under. A second index by
+    content hash lets the API recognise an exact redelivery from the raw bytes, before
+    any JSON parsing. Eviction is LRU once `capacity` entries are held.
+    """
+
+    def __init__(self, capacity: int = 10_000):
+        self.capacity = capacity
+        self._entries: "OrderedDict[DedupKey, DedupEntry]" = OrderedDict()
+        self._by_hash: Dict[str, DedupKey] = {}
+        # Called from the event loop and from startup/executor threads: all access goes through one lock
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, body_hash: str) -> Optional[DedupEntry]:
+        """Return the entry for an exact redelivery of `body_hash` (and count hit/miss)."""
+        with self._lock:
+            key = self._by_hash.get(body_hash)
+            if key is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def record(self, key: DedupKey, body_hash: str, internal_id: UUID) -> None:
+        """Remember that `body_hash` (revision `key`) is stored under `internal_id`."""
+        with self._lock:
+            self._put(DedupEntry(key=key, content_hash=body_hash, internal_id=internal_id))
+
+    def warm_up(self, entries: Iterable[Tuple[DedupKey, str, UUID]]) -> int:
+        """Pre-fill from persisted (key, body_hash, internal_id) entries.
+
+        Oldest first, so the newest end up most recent.
+        """
+        loaded = 0
+        with self._lock:
+            for key, body_hash, internal_id in entries:
+                self._put(DedupEntry(key=key, content_hash=body_hash, internal_id=internal_id))
+                loaded += 1
+        return loaded
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+    def _put(self, entry: DedupEntry) -> None:
+        # A new revision body for the same key replaces the previous hash
+        previous = self._entries.pop(entry.key, None)
+        if previous is not None:
+            self._by_hash.pop(previous.content_hash, None)
+
+        self._entries[entry.key] = entry
+        self._by_hash[entry.content_hash] = entry.key
+
+        while len(self._entries) > self.capacity:
+            _, evicted = self._entries.popitem(last=False)
+            self._by_hash.pop(evicted.content_hash, None)
+            self.evictions += 1
@@ -0,0 +1,203 @@
+import asyncio
+from typing import AsyncIterator, Dict, Optional, Set
+
+from app.models.internal.conversation import ConversationEvent
+from app.repositories.conversations import ConversationRepository
+from app.repositories.executor import RepositoryTimeoutError
+
+# Events fetched per query from the durable log (bounded memory)
+REPLAY_BATCH_SIZE = 500
+
+
+class Subscription:
+    """One SSE client: a bounded buffer of pending events.
+
+    `start` is the broker's log position when it subscribed: every event after it
+    is delivered through the buffer, anything up to it must come from a replay.
+    """
+
+    def __init__(self, buffer_size: int, start: int):
+        self.queue: "asyncio.Queue[ConversationEvent]" = asyncio.Queue(maxsize=buffer_size)
+        self.disconnected = asyncio.Event()
+        self.start = start
+
+
+class ConversationEventBroker:
+    """One tail of the durable `conversation_events` log per worker, fanned out to SSE subscribers.
+
+    A single task reads the log with events_since() and copies each event into every
+    subscriber's bounded buffer, so the database sees one query per wake-up however
+    many clients are connected. IngestionService calls notify() after each commit so
+    commits on this worker are read immediately; commits by other workers (or other
+    processes on the same DB) are picked up by the tail's periodic poll. The log only
+    grows at its end (seq is allocated inside serialized write transactions), so the
+    tail delivers every event in seq order, whichever worker committed it.
+
+    A subscriber whose buffer is full is disconnected; it reconnects with Last-Event-ID
+    and catches up from the log. The tail only runs while someone is subscribed.
+
+    All methods must be called from the event loop thread.
+    """
+
+    def __init__(self, repo: ConversationRepository, buffer_size: int = 256, poll_seconds: float = 1.0):
+        self.repo = repo
+        self.buffer_size = buffer_size
+        self.poll_seconds = poll_seconds
+        # Last seq fanned out (valid while the tail runs)
+        self.position = 0
+        self._subscribers: Set[Subscription] = set()
+        self._wake = asyncio.Event()
+        self._start_lock = asyncio.Lock()
+        self._task: Optional["asyncio.Task[None]"] = None
+
+        self.notified = 0
+        self.published = 0
+        self.disconnected = 0
+        self.log_reads = 0
+
+    async def subscribe(self) -> Subscription:
+        async with self._start_lock:
+            if self._task is None:
+                # New subscribers of a fresh tail start at the log's end
+                self.position = await self.repo.latest_event_seq_async()
+                self._task = asyncio.create_task(self._tail())
+            # No await between reading the position and registering: no event falls in between
+            subscription = Subscription(self.buffer_size, start=self.position)
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def notify(self) -> None:
+        self.notified += 1
+        self._wake.set()
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "subscribers": len(self._subscribers),
+            "notified": self.notified,
+            "published": self.published,
+            "disconnected": self.disconnected,
+            "log_reads": self.log_reads,
+        }
+
+    async def _tail(self) -> None:
+        try:
+            while self._subscribers:
+                # Clear before reading: a commit notified during the read triggers another read
+                self._wake.clear()
+                try:
+                    batch = await self.repo.events_since_async(self.position, REPLAY_BATCH_SIZE)
+                except RepositoryTimeoutError:
+                    batch = []  # read executor saturated: try again on the next poll
+                self.log_reads += 1
+                for event in batch:
+                    self._publish(event)
+                    self.position = event.seq
+                if len(batch) == REPLAY_BATCH_SIZE:
+                    continue  # still catching up
+
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+        except Exception:
+            # Don't leave clients waiting on a dead tail: they reconnect with Last-Event-ID
+            for subscription in list(self._subscribers):
+                self._disconnect(subscription)
+            raise
+        finally:
+            self._task = None
+
+    def _publish(self, event: ConversationEvent) -> None:
+        self.published += 1
+        for subscription in list(self._subscribers):
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._disconnect(subscription)
+
+    def _disconnect(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+        subscription.disconnected.set()
+        self.disconnected += 1
+
+
+def format_sse(event: ConversationEvent) -> str:
+    return f"id: {event.seq}\nevent: conversation\ndata: {event.item.model_dump_json()}\n\n"
+
+
+async def event_stream(
+    broker: ConversationEventBroker,
+    repo: ConversationRepository,
+    last_event_id: Optional[int] = None,
+    keepalive_seconds: float = 15.0,
+) -> AsyncIterator[str]:
+    """Yield SSE frames: replay after `last_event_id` from the event log, then live events.
+
+    The bulk of a replay runs before subscribing (so it can't overflow the buffer);
+    the few events committed meanwhile are replayed up to the subscription's start,
+    and live events already sent are skipped by seq. Ends cleanly, so the client
+    reconnects with Last-Event-ID, when this (slow) subscriber is disconnected or the
+    log can't be read in time.
+    """
+    # Tell EventSource clients how long to wait before reconnecting
+    yield "retry: 1000\n\n"
+
+    subscription = None
+    try:
+        last_sent = last_event_id
+        if last_sent is not None:
+            while True:
+                batch = await repo.events_since_async(last_sent, REPLAY_BATCH_SIZE)
+                for event in batch:
+                    yield format_sse(event)
+                    last_sent = event.seq
+                if len(batch) < REPLAY_BATCH_SIZE:
+                    break
+
+        subscription = await broker.subscribe()
+        if last_sent is None:
+            last_sent = subscription.start  # live events only
+        while last_sent < subscription.start:
+            batch = await repo.events_since_async(last_sent, REPLAY_BATCH_SIZE)
+            # Later events are delivered through the buffer
+            gap = [event for event in batch if event.seq <= subscription.start]
+            for event in gap:
+                yield format_sse(event)
+                last_sent = event.seq
+            if len(gap) < REPLAY_BATCH_SIZE:
+                break
+
+        while not subscription.disconnected.is_set():
+            get_event = asyncio.ensure_future(subscription.queue.get())
+            disconnected = asyncio.ensure_future(subscription.disconnected.wait())
+            done, _ = await asyncio.wait(
+                {get_event, disconnected}, timeout=keepalive_seconds, return_when=asyncio.FIRST_COMPLETED
+            )
+            if get_event not in done:
+                get_event.cancel()
+            if disconnected not in done:
+                disconnected.cancel()
+
+            if get_event in done:
+                event = get_event.result()
+                if event.seq > last_sent:
+                    yield format_sse(event)
+                    last_sent = event.seq
+            elif not done:
+                yield ": keep-alive\n\n"
+    except RepositoryTimeoutError:
+        return  # read executor saturated: end the response, the client resumes from its last id
+    finally:
+        if subscription is not None:
+            broker.unsubscribe(subscription)
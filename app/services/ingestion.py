@@ -1,7 +1,11 @@
+from functools import partial
 from pydantic import BaseModel, ConfigDict
 from app.adapters.intercom.mapper import map_intercom_to_internal
 from app.repositories.conversations import ConversationRepository
 from app.models.external.intercom import IntercomConversationRaw
+from app.services.dedup_cache import DedupCache
+from app.services.events import ConversationEventBroker
+from typing import Optional
 from uuid import UUID
 
 
@@ -20,22 +24,44 @@ class IngestionService:
     to add new providers (each with its own mapper) while reusing the same repo.
     """
 
-    def __init__(self, repo: ConversationRepository):
+    def __init__(
+        self,
+        repo: ConversationRepository,
+        dedup_cache: Optional[DedupCache] = None,
+        events: Optional[ConversationEventBroker] = None,
+    ):
         # Repository is injected so we can swap implementations (SQLite/in-memory/Postgres)
         # and easily test with a temporary database.
         self.repo = repo
+        self.dedup_cache = dedup_cache
+        self.events = events
 
-    def ingest_intercom(self, payload: IntercomConversationRaw) -> IngestResponse:
+    async def ingest_intercom(self, payload: IntercomConversationRaw, content_hash: Optional[str] = None) -> IngestResponse:
         """Ingest one Intercom conversation payload.
 
         1) Map provider payload into stable internal contract
         2) Persist with deduplication via (provider, external_id)
-        3) Return a small, stable response to the caller
+           (1 and 2 run together on the repo's write executor, off the event loop)
+        3) Remember the raw body hash so exact redeliveries skip steps 1-2
+        4) Wake up this worker's stream subscribers (new conversations only)
+        5) Return a small, stable response to the caller
         """
-        internal_conversation = map_intercom_to_internal(payload)
+        # upsert_with_event() returns (internal_id, deduplicated_flag, event_or_None)
+        internal_conversation, (internal_id, deduplicated, event) = await self.repo.build_and_upsert_async(
+            partial(map_intercom_to_internal, payload), content_hash
+        )
+
+        if self.events is not None and event is not None:
+            self.events.notify()
 
-        # upsert() returns (internal_id, deduplicated_flag)
-        internal_id, deduplicated = self.repo.upsert(internal_conversation)
+        if self.dedup_cache is not None and content_hash is not None:
+            updated_at = internal_conversation.updated_at
+            key = (
+                internal_conversation.provider,
+                internal_conversation.external_id,
+                updated_at.isoformat() if updated_at else None,
+            )
+            self.dedup_cache.record(key, content_hash, internal_id)
 
         return IngestResponse(
             id=internal_id,
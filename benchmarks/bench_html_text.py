@@ -0,0 +1,78 @@
+"""HTML -> plain text benchmark.
+
+Compares app.core.html_text.html_to_text (single forward scan, run once at
+ingest) with a stdlib HTMLParser-based extractor, on large Intercom-style bodies.
+It also times html_to_text on hostile bodies (unclosed tags and comments) at two
+sizes, to show the time grows linearly. HTMLParser is left out there because it
+is quadratic on some of them. Finally it shows the read-side saving: building
+1000 list previews from the stored content_text versus stripping HTML on every read.
+
+Run:
+    python -m benchmarks.bench_html_text
+"""
+import timeit
+from html.parser import HTMLParser
+
+from app.core.html_text import html_to_text
+
+PARAGRAPH = (
+    '<p>Hi <b>there</b>, thanks for reaching out about order&nbsp;#{i}. '
+    '<a href="https://example.com/orders/{i}">Track it here</a>.<br/>'
+    "We&#39;ve escalated this to our <i>billing</i> team &amp; will follow up.</p>"
+    "<ul><li>Item one</li><li>Item two</li></ul>"
+)
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def htmlparser_to_text(body: str) -> str:
+    parser = _TextExtractor()
+    parser.feed(body)
+    parser.close()
+    return " ".join(" ".join(parser.parts).split())
+
+
+def build_body(target_bytes: int) -> str:
+    parts, size, i = [], 0, 0
+    while size < target_bytes:
+        p = PARAGRAPH.format(i=i)
+        parts.append(p)
+        size += len(p)
+        i += 1
+    return "".join(parts)
+
+
+def per_call_ms(fn, arg, number: int) -> float:
+    return min(timeit.repeat(lambda: fn(arg), number=number, repeat=5)) / number * 1e3
+
+
+def main() -> None:
+    print(f"{'body':>10}{'html_to_text':>16}{'HTMLParser':>14}{'speedup':>10}")
+    for size, number in ((2_000, 2000), (50_000, 100), (1_000_000, 5)):
+        body = build_body(size)
+        fast = per_call_ms(html_to_text, body, number)
+        baseline = per_call_ms(htmlparser_to_text, body, number)
+        print(f"{len(body):>10}{fast:>13.3f} ms{baseline:>11.3f} ms{baseline / fast:>9.1f}x")
+
+    print(f"{'hostile body':<18}{'100 KB':>12}{'400 KB':>12}")
+    for unit in ("<style>", "<head>", "<!--", "<a ", "<p title='", '<a title="x>" '):
+        small, large = (per_call_ms(html_to_text, unit * (size // len(unit)), 3) for size in (100_000, 400_000))
+        print(f"{unit!r:<18}{small:>9.1f} ms{large:>9.1f} ms")
+
+    # Read path: 1000 list previews from 2KB HTML bodies
+    bodies = [build_body(2_000) for _ in range(1000)]
+    texts = [html_to_text(b) for b in bodies]
+    strip_each_read = min(timeit.repeat(lambda: [html_to_text(b)[:120] for b in bodies], number=5, repeat=3)) / 5
+    stored_text = min(timeit.repeat(lambda: [t[:120] for t in texts], number=5, repeat=3)) / 5
+    print(f"1000 previews: strip per read {strip_each_read * 1e3:.2f} ms, stored content_text {stored_text * 1e3:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Serialization + wire-size benchmark for internal responses.
+
+Compares FastAPI's default encoding path (jsonable_encoder -> dict -> JSONResponse)
+against ModelJSONResponse (model_dump_json straight to bytes), and reports wire
+bytes for identity/gzip/deflate on large conversations.
+
+Run:
+    python -m benchmarks.bench_serialization
+"""
+import timeit
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.responses import DEFAULT_COMPRESSLEVEL, ModelJSONResponse, compress_body
+from app.models.internal.conversation import (
+    ConversationListItem,
+    ConversationListResponse,
+    InternalConversation,
+    InternalMessage,
+    InternalParticipant,
+)
+
+
+def build_conversation(message_count: int, body_size: int = 400) -> InternalConversation:
+    start = datetime(2019, 9, 5, 14, 20, 9, tzinfo=timezone.utc)
+    participants = [
+        InternalParticipant(id=f"user-{i}", role="customer" if i % 2 else "agent") for i in range(4)
+    ]
+    messages = [
+        InternalMessage(
+            id=str(i),
+            author_participant_id=participants[i % len(participants)].id,
+            sent_at=start + timedelta(minutes=i),
+            content=(f"Message {i}: " + "lorem ipsum dolor sit amet " * (body_size // 27))[:body_size],
+        )
+        for i in range(message_count)
+    ]
+    return InternalConversation(
+        id=uuid4(),
+        external_id=str(uuid4().int)[:10],
+        created_at=start,
+        updated_at=start + timedelta(days=1),
+        participants=participants,
+        messages=messages,
+    )
+
+
+def build_list(item_count: int) -> ConversationListResponse:
+    now = datetime.now(tz=timezone.utc)
+    return ConversationListResponse(
+        items=[
+            ConversationListItem(
+                id=uuid4(),
+                provider="intercom",
+                external_id=str(i),
+                created_at=now,
+                updated_at=now,
+                participant_count=3,
+                message_count=20,
+                last_message_at=now,
+                last_message_preview="Thanks, that fixed it! " * 5,
+            )
+            for i in range(item_count)
+        ]
+    )
+
+
+def fastapi_default(model) -> bytes:
+    return JSONResponse(content=jsonable_encoder(model)).body
+
+
+def model_json(model) -> bytes:
+    return ModelJSONResponse(model).body
+
+
+def bench(label: str, model, number: int) -> None:
+    default_s = min(timeit.repeat(lambda: fastapi_default(model), number=number, repeat=5)) / number
+    direct_s = min(timeit.repeat(lambda: model_json(model), number=number, repeat=5)) / number
+
+    body = model_json(model)
+    gzip_len = len(compress_body(body, "gzip", DEFAULT_COMPRESSLEVEL))
+    deflate_len = len(compress_body(body, "deflate", DEFAULT_COMPRESSLEVEL))
+    gzip_s = min(timeit.repeat(lambda: compress_body(body, "gzip"), number=number, repeat=5)) / number
+
+    print(f"{label}")
+    print(f"  serialize  default={default_s * 1e3:8.3f} ms  model_dump_json={direct_s * 1e3:8.3f} ms"
+          f"  speedup={default_s / direct_s:5.1f}x")
+    print(f"  wire bytes identity={len(body):>9}  gzip={gzip_len:>8}  deflate={deflate_len:>8}"
+          f"  ratio={len(body) / gzip_len:5.1f}x  (gzip cost {gzip_s * 1e3:.3f} ms)")
+
+
+def main() -> None:
+    bench("InternalConversation (100 messages)", build_conversation(100), number=200)
+    bench("InternalConversation (2000 messages)", build_conversation(2000), number=10)
+    bench("ConversationListResponse (1000 items)", build_list(1000), number=20)
+    bench("ConversationListResponse (10000 items)", build_list(10000), number=3)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Open-loop load generator for end-to-end saturation curves.
+
+Requests are fired on a fixed arrival schedule (constant rate plus periodic bursts),
+whether or not earlier requests have finished. Latency is measured from each
+request's *intended* send time, not from when it was actually sent. A stalled
+server therefore shows up as latency on every request that should have gone out
+meanwhile (coordinated-omission correction), instead of silently lowering the
+offered load.
+
+Examples:
+    # start a local server on a temp DB and sweep offered load
+    python -m loadtest.loadgen --start-server --rates 50,100,200,400 --duration 20
+
+    # against an already running service, with bursts of 100 every 5s
+    python -m loadtest.loadgen --url http://localhost:8000 --rates 200 --burst-every 5 --burst-size 100
+"""
+import argparse
+import asyncio
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+
+from loadtest.webhooks import DEFAULT_PAYLOAD, OPERATIONS, PlannedRequest, WebhookSimulator, parse_mix
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def arrival_schedule(rate: float, duration: float, burst_every: float = 0.0, burst_size: int = 0) -> Iterator[float]:
+    """Yield intended send offsets (seconds from start), in order.
+
+    `rate` requests/s evenly spaced, plus `burst_size` simultaneous extra requests
+    every `burst_every` seconds (if both are > 0).
+    """
+    steady = (i / rate for i in range(int(rate * duration))) if rate > 0 else iter(())
+    bursts = (
+        (k * burst_every for k in range(1, int(duration / burst_every) + 1) if k * burst_every < duration)
+        if burst_every > 0 and burst_size > 0
+        else iter(())
+    )
+
+    next_burst = next(bursts, None)
+    for offset in steady:
+        while next_burst is not None and next_burst <= offset:
+            for _ in range(burst_size):
+                yield next_burst
+            next_burst = next(bursts, None)
+        yield offset
+    while next_burst is not None:
+        for _ in range(burst_size):
+            yield next_burst
+        next_burst = next(bursts, None)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list (q in 0..100)."""
+    if not sorted_values:
+        return float("nan")
+    # round() first: 99.9 / 100 * 1000 is 999.0000000000001 in floating point
+    rank = max(1, math.ceil(round(q / 100 * len(sorted_values), 9)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class Sample:
+    operation: str
+    intended_at: float  # offset from run start
+    latency: float  # completion - intended send time (seconds)
+    ok: bool
+
+
+@dataclass
+class RunResult:
+    rate: float
+    duration: float
+    samples: List[Sample] = field(default_factory=list)
+
+
+async def run_load(
+    base_url: str,
+    simulator: WebhookSimulator,
+    rate: float,
+    duration: float,
+    burst_every: float = 0.0,
+    burst_size: int = 0,
+    timeout: float = 30.0,
+) -> RunResult:
+    result = RunResult(rate=rate, duration=duration)
+    # No client-side cap on connections: an open-loop generator must not queue on its own pool
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=200)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        in_flight = set()
+
+        async def fire(planned: PlannedRequest, intended_at: float) -> None:
+            ok = False
+            try:
+                response = await client.request(
+                    planned.method,
+                    planned.path,
+                    content=planned.body,
+                    headers={"Content-Type": "application/json"} if planned.body is not None else None,
+                )
+                ok = response.status_code < 400
+                if ok and planned.method == "POST":
+                    simulator.record_ingest_response(response.json())
+            except httpx.HTTPError:
+                ok = False
+            latency = loop.time() - (start + intended_at)
+            result.samples.append(Sample(planned.operation, intended_at, latency, ok))
+
+        for intended_at in arrival_schedule(rate, duration, burst_every, burst_size):
+            delay = start + intended_at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = asyncio.ensure_future(fire(simulator.next_request(), intended_at))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+
+        if in_flight:
+            await asyncio.wait(in_flight)
+
+    return result
+
+
+def summarize(result: RunResult) -> str:
+    lines = [f"== offered {result.rate:g} req/s for {result.duration:g}s: {len(result.samples)} requests"]
+
+    by_operation: Dict[str, List[Sample]] = defaultdict(list)
+    for sample in result.samples:
+        by_operation[sample.operation].append(sample)
+
+    lines.append(f"{'operation':<12}{'count':>8}{'errors':>9}{'p50 ms':>10}{'p99 ms':>10}{'p999 ms':>10}{'max ms':>10}")
+    for operation in [*OPERATIONS, "all"]:
+        samples = result.samples if operation == "all" else by_operation.get(operation, [])
+        if not samples:
+            continue
+        latencies = sorted(s.latency * 1e3 for s in samples)
+        errors = sum(not s.ok for s in samples)
+        lines.append(
+            f"{operation:<12}{len(samples):>8}{errors / len(samples):>8.1%} "
+            f"{percentile(latencies, 50):>9.1f}{percentile(latencies, 99):>10.1f}"
+            f"{percentile(latencies, 99.9):>10.1f}{latencies[-1]:>10.1f}"
+        )
+
+    # Throughput over time, bucketed by completion second
+    lines.append(f"{'second':<8}{'done/s':>8}{'errors':>8}{'p99 ms':>10}")
+    buckets: Dict[int, List[Sample]] = defaultdict(list)
+    for sample in result.samples:
+        buckets[int(sample.intended_at + sample.latency)].append(sample)
+    for second in sorted(buckets):
+        samples = buckets[second]
+        latencies = sorted(s.latency * 1e3 for s in samples)
+        lines.append(
+            f"{second:<8}{len(samples):>8}{sum(not s.ok for s in samples):>8}{percentile(latencies, 99):>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def start_local_server(port: int, workers: int, workdir: str) -> subprocess.Popen:
+    """Start uvicorn in `workdir` (so kbms.sqlite3 and its partitions land there) and wait for /health."""
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT) + os.pathsep + os.environ.get("PYTHONPATH", "")}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning", "--no-access-log"],
+        cwd=workdir,
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 30s")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Open-loop load generator for the KBMS service")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rates", default="100", help="comma-separated offered loads (req/s) to sweep")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per rate")
+    parser.add_argument("--burst-every", type=float, default=0.0, help="seconds between bursts (0 = none)")
+    parser.add_argument("--burst-size", type=int, default=0, help="extra simultaneous requests per burst")
+    parser.add_argument("--mix", default=None, help='e.g. "new=0.3,update=0.2,redelivery=0.3,list=0.05,get=0.15"')
+    parser.add_argument("--payload", default=str(DEFAULT_PAYLOAD), help="template Intercom payload")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--start-server", action="store_true", help="start uvicorn on a temp DB first")
+    parser.add_argument("--port", type=int, default=8765, help="port for --start-server")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for --start-server")
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix) if args.mix else None
+    rates = [float(r) for r in args.rates.split(",")]
+
+    server = None
+    workdir = tempfile.TemporaryDirectory(prefix="kbms-load-")
+    base_url = args.url
+    if args.start_server:
+        server = start_local_server(args.port, args.workers, workdir.name)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        # One simulator across the sweep: later rates also exercise updates/redeliveries of earlier data
+        simulator = WebhookSimulator.from_file(Path(args.payload), mix=mix, seed=args.seed)
+        for rate in rates:
+            result = asyncio.run(
+                run_load(base_url, simulator, rate, args.duration, args.burst_every, args.burst_size)
+            )
+            print(summarize(result), flush=True)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+        workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
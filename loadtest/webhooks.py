@@ -0,0 +1,132 @@
+"""Local Intercom webhook simulator: turns payload_mock.json into a realistic request stream.
+
+Each generated request is one of:
+- new:        a conversation id we have not sent before
+- update:     a known conversation, with `updated_at` bumped and one more conversation part
+- redelivery: the exact bytes of an earlier delivery (Intercom retries)
+- list:       GET /internal/conversations
+- get:        GET /internal/conversations/{id} for an id the service has returned
+"""
+import copy
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+INGEST_PATH = "/integrations/intercom/conversations"
+LIST_PATH = "/internal/conversations"
+
+OPERATIONS = ("new", "update", "redelivery", "list", "get")
+DEFAULT_MIX = {"new": 0.3, "update": 0.2, "redelivery": 0.3, "list": 0.05, "get": 0.15}
+
+DEFAULT_PAYLOAD = Path(__file__).resolve().parent.parent / "payload_mock.json"
+
+# Bodies kept for redelivery (random replacement beyond this keeps memory flat on long runs)
+MAX_REMEMBERED_BODIES = 10_000
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse "new=0.3,update=0.2,..." into normalized weights."""
+    mix: Dict[str, float] = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}; expected one of {', '.join(OPERATIONS)}")
+        mix[name] = float(weight)
+
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("Mix weights must sum to a positive number")
+    return {name: weight / total for name, weight in mix.items()}
+
+
+@dataclass(frozen=True)
+class PlannedRequest:
+    operation: str
+    method: str
+    path: str
+    body: Optional[bytes] = None
+
+
+class WebhookSimulator:
+    """Generates PlannedRequests following `mix`, built from a template Intercom payload.
+
+    Not thread-safe; the load generator calls it from its single scheduling task.
+    """
+
+    def __init__(self, template: dict, mix: Optional[Dict[str, float]] = None, seed: Optional[int] = None):
+        self.template = template
+        self.mix = mix or DEFAULT_MIX
+        self.random = random.Random(seed)
+
+        self._next_id = 0
+        self._latest: Dict[str, dict] = {}  # external_id -> last payload sent
+        self._external_ids: List[str] = []
+        self._sent_bodies: List[bytes] = []
+        self.known_internal_ids: List[str] = []
+
+    @classmethod
+    def from_file(cls, path: Path = DEFAULT_PAYLOAD, **kwargs) -> "WebhookSimulator":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), **kwargs)
+
+    def next_request(self) -> PlannedRequest:
+        operation = self.random.choices(list(self.mix), weights=list(self.mix.values()))[0]
+
+        # Fall back to "new" until there is something to update / redeliver / read
+        if operation in ("update", "redelivery") and not self._latest:
+            operation = "new"
+        if operation == "get" and not self.known_internal_ids:
+            operation = "new" if not self._latest else "list"
+
+        if operation == "new":
+            return self._ingest("new", self._new_payload())
+        if operation == "update":
+            return self._ingest("update", self._updated_payload())
+        if operation == "redelivery":
+            return PlannedRequest("redelivery", "POST", INGEST_PATH, self.random.choice(self._sent_bodies))
+        if operation == "list":
+            return PlannedRequest("list", "GET", LIST_PATH)
+        return PlannedRequest("get", "GET", f"{LIST_PATH}/{self.random.choice(self.known_internal_ids)}")
+
+    def record_ingest_response(self, body: dict) -> None:
+        """Remember internal ids returned by the service so "get" has something to fetch."""
+        internal_id = body.get("id")
+        if internal_id and not body.get("deduplicated"):
+            self.known_internal_ids.append(internal_id)
+
+    def _ingest(self, operation: str, payload: dict) -> PlannedRequest:
+        if payload["id"] not in self._latest:
+            self._external_ids.append(payload["id"])
+        self._latest[payload["id"]] = payload
+        body = json.dumps(payload).encode("utf-8")
+        if len(self._sent_bodies) < MAX_REMEMBERED_BODIES:
+            self._sent_bodies.append(body)
+        else:
+            self._sent_bodies[self.random.randrange(MAX_REMEMBERED_BODIES)] = body
+        return PlannedRequest(operation, "POST", INGEST_PATH, body)
+
+    def _new_payload(self) -> dict:
+        payload = copy.deepcopy(self.template)
+        self._next_id += 1
+        payload["id"] = f"load-{self._next_id}"
+        payload["created_at"] = self.template["created_at"] + self._next_id
+        payload["updated_at"] = payload["created_at"]
+        return payload
+
+    def _updated_payload(self) -> dict:
+        previous = self._latest[self.random.choice(self._external_ids)]
+        payload = copy.deepcopy(previous)
+        payload["updated_at"] = (payload.get("updated_at") or payload["created_at"]) + 60
+
+        parts = payload.setdefault("conversation_parts", {}).setdefault("conversation_parts", [])
+        if parts:
+            part = copy.deepcopy(parts[-1])
+            part["id"] = f"{payload['id']}-part-{len(parts) + 1}"
+            part["created_at"] = payload["updated_at"]
+            part["body"] = f"Update {len(parts) + 1} on {payload['id']}"
+            parts.append(part)
+            payload["conversation_parts"]["total_count"] = len(parts)
+        return payload
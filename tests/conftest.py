@@ -1,11 +1,39 @@
 # tests/conftest.py
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Optional
+from uuid import uuid4
 
 import pytest
 from fastapi.testclient import TestClient
 
 from app.main import create_app
+from app.models.internal.conversation import InternalConversation, InternalMessage, InternalParticipant
 from app.repositories.conversations import ConversationRepository
+from app.services.dedup_cache import DedupCache
+from app.services.events import ConversationEventBroker
+
+BASE_TIME = datetime(2024, 1, 15, tzinfo=timezone.utc)
+
+
+def build_conversation(
+    external_id: str, created_at: datetime = BASE_TIME, updated_at: Optional[datetime] = None
+) -> InternalConversation:
+    """A normalized conversation for repository tests: a customer and an admin, one HTML and one plain-text message."""
+    return InternalConversation(
+        id=uuid4(),
+        external_id=external_id,
+        created_at=created_at,
+        updated_at=updated_at,
+        participants=[
+            InternalParticipant(id="u1", role="customer"),
+            InternalParticipant(id="a1", role="admin"),
+        ],
+        messages=[
+            InternalMessage(id=f"{external_id}-1", author_participant_id="u1", sent_at=created_at, content="<p>Hi</p>", content_text="Hi"),
+            InternalMessage(id=f"{external_id}-2", author_participant_id="a1", sent_at=created_at + timedelta(minutes=5), content="Hello, how can we help?"),
+        ],
+    )
 
 
 @pytest.fixture()
@@ -17,5 +45,7 @@ def client(tmp_path: Path) -> TestClient:
     repo = ConversationRepository(db_path=str(db_path))
     repo._init_db()
     app.state.repo = repo
+    app.state.dedup_cache = DedupCache()
+    app.state.events = ConversationEventBroker(repo)
 
     return TestClient(app)
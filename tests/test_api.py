@@ -1,5 +1,17 @@
+import sqlite3
+import threading
+import time
 from uuid import UUID
 
+from fastapi.testclient import TestClient
+
+from app.core import responses
+from app.main import create_app
+from app.repositories.conversations import ConversationRepository
+from app.repositories.sqlite_write import WriteRetryPolicy
+from app.services import ingestion
+from app.services.dedup_cache import DedupCache
+
 
 def intercom_payload(external_id: str = "1122334455") -> dict:
     return {
@@ -165,3 +177,176 @@ def test_get_conversation_not_found_returns_404(client):
     body = unwrap_detail_if_needed(r.json())
     assert body["error_code"] == "not_found"
     assert body["message"] == "Conversation not found"
+
+
+def large_intercom_payload(external_id: str = "5566778899", parts: int = 50) -> dict:
+    payload = intercom_payload(external_id)
+    template = payload["conversation_parts"]["conversation_parts"][0]
+    payload["conversation_parts"]["conversation_parts"] = [
+        {**template, "id": str(i), "body": f"Follow-up message number {i}", "created_at": 1567693273 + i}
+        for i in range(parts)
+    ]
+    payload["conversation_parts"]["total_count"] = parts
+    return payload
+
+
+def test_large_conversation_is_gzip_compressed_when_accepted(client):
+    r = client.post("/integrations/intercom/conversations", json=large_intercom_payload())
+    assert r.status_code == 201
+    assert "content-encoding" not in r.headers
+    conv_id = r.json()["id"]
+
+    r2 = client.get(f"/internal/conversations/{conv_id}", headers={"Accept-Encoding": "gzip, deflate"})
+    assert r2.status_code == 200
+    assert r2.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in r2.headers["vary"]
+    assert len(r2.json()["messages"]) == 51
+
+
+def test_compression_negotiates_deflate_and_identity(client):
+    r = client.post("/integrations/intercom/conversations", json=large_intercom_payload())
+    conv_id = r.json()["id"]
+
+    r_deflate = client.get(f"/internal/conversations/{conv_id}", headers={"Accept-Encoding": "gzip;q=0, deflate"})
+    assert r_deflate.headers["content-encoding"] == "deflate"
+    assert r_deflate.json()["id"] == conv_id
+
+    r_identity = client.get(f"/internal/conversations/{conv_id}", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in r_identity.headers
+    assert r_identity.json()["id"] == conv_id
+
+
+def test_small_response_is_not_compressed(client):
+    client.post("/integrations/intercom/conversations", json=intercom_payload("1"))
+
+    r = client.get("/internal/conversations", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert "content-encoding" not in r.headers
+
+
+def test_exact_redelivery_is_answered_from_dedup_cache(client):
+    payload = intercom_payload("1122334455")
+
+    r1 = client.post("/integrations/intercom/conversations", json=payload)
+    assert r1.status_code == 201
+
+    # Make any DB access fail: a cache hit must not touch the repository
+    repo = client.app.state.repo
+    client.app.state.repo = None
+    r2 = client.post("/integrations/intercom/conversations", json=payload)
+    client.app.state.repo = repo
+
+    assert r2.status_code == 200
+    assert r2.json() == {**r1.json(), "deduplicated": True}
+
+    metrics = client.get("/internal/metrics").json()["dedup_cache"]
+    assert metrics["hits"] == 1
+    assert metrics["misses"] == 1
+    assert metrics["hit_rate"] == 0.5
+
+
+def test_changed_body_for_same_external_id_falls_through_to_db_dedup(client):
+    r1 = client.post("/integrations/intercom/conversations", json=intercom_payload("1122334455"))
+    payload = intercom_payload("1122334455")
+    payload["some_future_field"] = {"new": "other value"}
+
+    r2 = client.post("/integrations/intercom/conversations", json=payload)
+    assert r2.status_code == 200
+    assert r2.json()["id"] == r1.json()["id"]
+    assert client.get("/internal/metrics").json()["dedup_cache"]["hits"] == 0
+
+
+def test_dedup_cache_is_warmed_up_from_db(tmp_path):
+    repo = ConversationRepository(db_path=str(tmp_path / "warm.sqlite3"))
+    repo._init_db()
+    payload = intercom_payload("1122334455")
+
+    app = create_app()
+    app.state.repo = repo
+    app.state.dedup_cache = DedupCache()
+    id1 = TestClient(app).post("/integrations/intercom/conversations", json=payload).json()["id"]
+
+    # "Restart": fresh cache warmed from what the DB persisted
+    restarted = create_app()
+    restarted.state.repo = repo
+    restarted.state.dedup_cache = DedupCache()
+    assert restarted.state.dedup_cache.warm_up(repo.recent_dedup_entries(100)) == 1
+
+    client = TestClient(restarted)
+    r = client.post("/integrations/intercom/conversations", json=payload)
+    assert r.status_code == 200
+    assert r.json()["id"] == id1
+    assert client.get("/internal/metrics").json()["dedup_cache"]["hits"] == 1
+
+
+def test_ingest_returns_503_when_database_stays_locked(client):
+    repo = client.app.state.repo
+    repo.write_policy = WriteRetryPolicy(max_attempts=2, busy_timeout=0.01, base_delay=0.001, max_delay=0.002)
+
+    blocker = sqlite3.connect(repo.db_path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        r = client.post("/integrations/intercom/conversations", json=intercom_payload("1"))
+    finally:
+        blocker.execute("ROLLBACK")
+        blocker.close()
+
+    assert r.status_code == 503
+    assert r.headers["retry-after"] == "1"
+    assert r.json()["error_code"] == "database_busy"
+    assert client.get("/internal/metrics").json()["write_lock"]["busy_failures"] == 1
+
+
+def test_slow_read_returns_503_timeout_and_health_stays_up(client):
+    repo = client.app.state.repo
+    repo.read_executor.timeout = 0.05
+    repo.get_conversation = lambda conversation_id: time.sleep(0.5)
+
+    r = client.get("/internal/conversations/00000000-0000-0000-0000-000000000000")
+    assert r.status_code == 503
+    assert r.json()["error_code"] == "timeout"
+    assert r.headers["retry-after"] == "1"
+
+    assert client.get("/health").status_code == 200
+    assert client.get("/internal/metrics").json()["executors"]["read"]["timeouts"] == 1
+
+
+def test_html_bodies_get_plain_text_and_preview_from_text(client):
+    payload = intercom_payload("html-1")
+    part = payload["conversation_parts"]["conversation_parts"][0]
+    part["body"] = "<p>" + "<b>x</b>" * 200 + "</p>"
+
+    r = client.post("/integrations/intercom/conversations", json=payload)
+    conv_id = r.json()["id"]
+
+    message = client.get(f"/internal/conversations/{conv_id}").json()["messages"][-1]
+    assert message["content"] == part["body"]
+    assert message["content_text"] == "x" * 200
+
+    item = client.get("/internal/conversations").json()["items"][0]
+    assert item["last_message_preview"] == "x" * 120
+
+
+def test_mapping_rendering_and_compression_run_off_the_event_loop(client, monkeypatch):
+    threads = []
+
+    def record_thread(fn):
+        def wrapper(*args, **kwargs):
+            threads.append((fn.__name__, threading.current_thread().name))
+            return fn(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(ingestion, "map_intercom_to_internal", record_thread(ingestion.map_intercom_to_internal))
+    monkeypatch.setattr(responses.ModelJSONResponse, "render", record_thread(responses.ModelJSONResponse.render))
+    monkeypatch.setattr(responses, "compress_body", record_thread(responses.compress_body))
+
+    conv_id = client.post("/integrations/intercom/conversations", json=large_intercom_payload()).json()["id"]
+    name, thread = threads[0]
+    assert name == "map_intercom_to_internal" and thread.startswith("repo-write")
+
+    threads.clear()
+    for path in ("/internal/conversations", f"/internal/conversations/{conv_id}"):
+        r = client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert r.status_code == 200
+    assert [name for name, _ in threads] == ["render", "render", "compress_body"]
+    assert all(thread.startswith("repo-read") for _, thread in threads)
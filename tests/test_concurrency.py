@@ -0,0 +1,78 @@
+import multiprocessing
+import sqlite3
+
+import pytest
+
+from app.repositories.conversations import ConversationRepository
+from app.repositories.sqlite_write import DatabaseBusyError, WriteRetryPolicy
+from tests.conftest import build_conversation
+
+WORKERS = 8
+CONVERSATIONS = 60
+
+
+def upsert_all(db_path: str, worker: int, results) -> None:
+    repo = ConversationRepository(db_path=db_path)
+    # Every worker ingests the same external ids (rotated) so inserts and dedups collide
+    ids = []
+    for i in range(CONVERSATIONS):
+        external_id = str((i + worker * 7) % CONVERSATIONS)
+        internal_id, deduplicated = repo.upsert(build_conversation(external_id))
+        ids.append((external_id, str(internal_id), deduplicated))
+    results.put((ids, repo.write_stats.stats()))
+
+
+def test_multi_process_upserts_lose_and_duplicate_nothing(tmp_path):
+    db_path = str(tmp_path / "stress.sqlite3")
+    ConversationRepository(db_path=db_path)._init_db()
+
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    processes = [ctx.Process(target=upsert_all, args=(db_path, w, results)) for w in range(WORKERS)]
+    for p in processes:
+        p.start()
+    outcomes = [results.get(timeout=60) for _ in processes]
+    for p in processes:
+        p.join(timeout=60)
+        assert p.exitcode == 0
+
+    with sqlite3.connect(db_path) as connection:
+        rows = connection.execute("SELECT external_id, id FROM conversation_index").fetchall()
+    stored = dict(rows)
+
+    # Nothing lost, nothing duplicated
+    assert len(rows) == CONVERSATIONS
+    assert set(stored) == {str(i) for i in range(CONVERSATIONS)}
+
+    # Every worker saw the one stored id per external_id; exactly one "created" per id
+    created = 0
+    for ids, stats in outcomes:
+        assert stats["busy_failures"] == 0
+        for external_id, internal_id, deduplicated in ids:
+            assert stored[external_id] == internal_id
+            created += not deduplicated
+    assert created == CONVERSATIONS
+
+
+def test_upsert_raises_database_busy_after_retry_budget(tmp_path):
+    db_path = str(tmp_path / "busy.sqlite3")
+    policy = WriteRetryPolicy(max_attempts=3, busy_timeout=0.01, base_delay=0.001, max_delay=0.002)
+    repo = ConversationRepository(db_path=db_path, write_policy=policy)
+    repo._init_db()
+
+    # Another "process" holds the write lock for the whole test
+    blocker = sqlite3.connect(db_path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        with pytest.raises(DatabaseBusyError):
+            repo.upsert(build_conversation("1"))
+    finally:
+        blocker.execute("ROLLBACK")
+        blocker.close()
+
+    stats = repo.write_stats.stats()
+    assert stats["busy_failures"] == 1
+    assert stats["busy_retries"] == 2
+
+    # Lock released: the same write now succeeds
+    assert repo.upsert(build_conversation("1"))[1] is False
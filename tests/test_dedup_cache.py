@@ -0,0 +1,33 @@
+from uuid import uuid4
+
+from app.services.dedup_cache import DedupCache, content_hash
+
+
+def test_dedup_cache_evicts_least_recently_used():
+    cache = DedupCache(capacity=2)
+    ids = [uuid4() for _ in range(3)]
+    hashes = [content_hash(f"body-{i}".encode()) for i in range(3)]
+
+    cache.record(("intercom", "0", None), hashes[0], ids[0])
+    cache.record(("intercom", "1", None), hashes[1], ids[1])
+    assert cache.lookup(hashes[0]).internal_id == ids[0]  # 0 is now most recent
+
+    cache.record(("intercom", "2", None), hashes[2], ids[2])
+
+    assert len(cache) == 2
+    assert cache.lookup(hashes[1]) is None
+    assert cache.lookup(hashes[2]).internal_id == ids[2]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_dedup_cache_new_body_for_same_key_replaces_hash():
+    cache = DedupCache()
+    key = ("intercom", "1", "2019-09-13T09:44:41+00:00")
+    internal_id = uuid4()
+
+    cache.record(key, content_hash(b"v1"), internal_id)
+    cache.record(key, content_hash(b"v2"), internal_id)
+
+    assert len(cache) == 1
+    assert cache.lookup(content_hash(b"v1")) is None
+    assert cache.lookup(content_hash(b"v2")).external_id == "1"
@@ -0,0 +1,174 @@
+import asyncio
+
+import pytest
+
+from app.repositories.conversations import ConversationRepository
+from app.repositories.executor import RepositoryTimeoutError
+from app.services.events import ConversationEventBroker, event_stream
+from tests.conftest import build_conversation
+
+
+def frame_ids(frames):
+    return [int(line[4:]) for frame in frames for line in frame.splitlines() if line.startswith("id: ")]
+
+
+async def next_frame(stream):
+    return await asyncio.wait_for(stream.__anext__(), timeout=5)
+
+
+@pytest.fixture()
+def repo(tmp_path):
+    repo = ConversationRepository(db_path=str(tmp_path / "kbms.sqlite3"))
+    repo._init_db()
+    yield repo
+    repo.close()
+
+
+def test_stream_replays_after_last_event_id_then_follows_live_events(repo):
+    events = [repo.upsert_with_event(build_conversation(str(i)))[2] for i in range(3)]
+    assert [e.seq for e in events] == [1, 2, 3]
+    assert repo.upsert_with_event(build_conversation("0"))[2] is None  # dedup: no event
+
+    async def scenario():
+        broker = ConversationEventBroker(repo)
+        stream = event_stream(broker, repo, last_event_id=1)
+        frames = [await next_frame(stream) for _ in range(3)]  # retry hint + seq 2, 3
+
+        pending = asyncio.ensure_future(next_frame(stream))
+        await asyncio.sleep(0.05)  # subscribed, waiting for live events
+        repo.upsert_with_event(build_conversation("3"))
+        broker.notify()
+        broker.notify()  # a spurious wake-up must not resend anything
+        frames.append(await pending)
+        await stream.aclose()
+        await broker.close()
+        return frames, broker.stats()
+
+    frames, stats = asyncio.run(scenario())
+
+    assert frames[0].startswith("retry:")
+    assert frame_ids(frames) == [2, 3, 4]
+    assert '"external_id":"3"' in frames[-1]
+    assert stats["subscribers"] == 0
+    assert stats["published"] == 1
+
+
+def test_one_tail_per_worker_sees_commits_of_other_workers_in_seq_order(tmp_path):
+    # Two repositories on one file stand in for two uvicorn workers; only A's broker is ours
+    db_path = str(tmp_path / "kbms.sqlite3")
+    worker_a = ConversationRepository(db_path=db_path)
+    worker_a._init_db()
+    worker_b = ConversationRepository(db_path=db_path)
+    worker_a.upsert_with_event(build_conversation("before"))
+
+    async def scenario():
+        broker = ConversationEventBroker(worker_a, poll_seconds=0.05)
+        streams = [event_stream(broker, worker_a) for _ in range(3)]
+        for stream in streams:
+            await next_frame(stream)  # retry hint
+        pending = [asyncio.ensure_future(next_frame(stream)) for stream in streams]
+        await asyncio.sleep(0.05)  # all subscribed; the tail starts after seq 1
+
+        worker_b.upsert_with_event(build_conversation("b"))  # seq 2, never announced here
+        worker_a.upsert_with_event(build_conversation("a"))  # seq 3
+        broker.notify()
+        frames = [[await frame] for frame in pending]
+        for stream_frames, stream in zip(frames, streams):
+            stream_frames.append(await next_frame(stream))
+
+        worker_b.upsert_with_event(build_conversation("b2"))  # seq 4: found by polling alone
+        for stream_frames, stream in zip(frames, streams):
+            stream_frames.append(await next_frame(stream))
+
+        for stream in streams:
+            await stream.aclose()
+        await broker.close()
+        return frames, broker.stats()
+
+    try:
+        frames, stats = asyncio.run(scenario())
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+    assert [frame_ids(stream_frames) for stream_frames in frames] == [[2, 3, 4]] * 3
+    assert stats["published"] == 3  # once per event, not once per subscriber
+
+
+def test_subscribers_share_one_log_read_per_wake_up(repo):
+    async def scenario():
+        broker = ConversationEventBroker(repo, poll_seconds=60)
+        streams = [event_stream(broker, repo) for _ in range(5)]
+        for stream in streams:
+            await next_frame(stream)
+        pending = [asyncio.ensure_future(next_frame(stream)) for stream in streams]
+        await asyncio.sleep(0.05)
+        reads_before = broker.stats()["log_reads"]
+
+        repo.upsert_with_event(build_conversation("1"))
+        broker.notify()
+        frames = [await frame for frame in pending]
+        reads_after = broker.stats()["log_reads"]
+
+        for stream in streams:
+            await stream.aclose()
+        await broker.close()
+        return frames, reads_after - reads_before
+
+    frames, reads = asyncio.run(scenario())
+
+    assert frame_ids(frames) == [1] * 5
+    assert reads == 1
+
+
+def test_slow_subscriber_is_disconnected_and_resumes_from_the_log(repo):
+    async def scenario():
+        broker = ConversationEventBroker(repo, buffer_size=2)
+        stream = event_stream(broker, repo)
+        await next_frame(stream)
+        pending = asyncio.ensure_future(next_frame(stream))
+        await asyncio.sleep(0.05)
+
+        # The client stops reading after the first event: its buffer overflows
+        for i in range(4):
+            repo.upsert_with_event(build_conversation(str(i)))
+        broker.notify()
+        first = await pending
+        with pytest.raises(StopAsyncIteration):
+            await next_frame(stream)
+        stats = broker.stats()
+
+        # Reconnect with Last-Event-ID: the rest comes from the durable log
+        resumed = event_stream(broker, repo, last_event_id=frame_ids([first])[0])
+        frames = [await next_frame(resumed) for _ in range(4)]
+        await resumed.aclose()
+        await broker.close()
+        return first, stats, frames
+
+    first, stats, frames = asyncio.run(scenario())
+
+    assert frame_ids([first]) == [1]
+    assert stats["disconnected"] == 1
+    assert stats["subscribers"] == 0
+    assert frame_ids(frames) == [2, 3, 4]
+
+
+def test_stream_ends_cleanly_when_the_log_read_times_out(repo, monkeypatch):
+    async def saturated(seq, limit):
+        raise RepositoryTimeoutError("read operation events_since timed out")
+
+    monkeypatch.setattr(repo, "events_since_async", saturated)
+
+    async def scenario():
+        broker = ConversationEventBroker(repo)
+        stream = event_stream(broker, repo, last_event_id=0)
+        frames = [await next_frame(stream)]
+        with pytest.raises(StopAsyncIteration):
+            await next_frame(stream)
+        await broker.close()
+        return frames, broker.stats()
+
+    frames, stats = asyncio.run(scenario())
+
+    assert frames[0].startswith("retry:")
+    assert stats["subscribers"] == 0
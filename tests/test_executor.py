@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.repositories.executor import RepositoryExecutor, RepositoryTimeoutError
+
+
+def test_saturated_write_executor_does_not_delay_reads():
+    reads = RepositoryExecutor("read", max_workers=2, timeout=1.0)
+    writes = RepositoryExecutor("write", max_workers=1, timeout=5.0)
+    release = threading.Event()
+
+    async def scenario():
+        # One write running, four queued behind it
+        blocked = [asyncio.ensure_future(writes.run(release.wait)) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        assert writes.stats()["active"] == 1
+        assert writes.stats()["queued"] == 4
+
+        started = time.perf_counter()
+        assert await reads.run(lambda: "ok") == "ok"
+        read_latency = time.perf_counter() - started
+
+        release.set()
+        await asyncio.gather(*blocked)
+        return read_latency
+
+    try:
+        assert asyncio.run(scenario()) < 0.5
+        assert writes.stats()["completed"] == 5
+        assert writes.stats()["queued"] == 0
+    finally:
+        release.set()
+        reads.shutdown()
+        writes.shutdown()
+
+
+def test_timed_out_queued_operation_is_dropped():
+    executor = RepositoryExecutor("write", max_workers=1, timeout=0.05)
+    release = threading.Event()
+    ran = []
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(release.wait, timeout=5.0))
+        await asyncio.sleep(0.01)
+        with pytest.raises(RepositoryTimeoutError):
+            await executor.run(ran.append, "late")
+        release.set()
+        await running
+        # Let the worker pick up (and drop) the abandoned call
+        await executor.run(lambda: None)
+
+    try:
+        asyncio.run(scenario())
+        assert ran == []
+        assert executor.stats()["timeouts"] == 1
+        assert executor.stats()["dropped"] == 1
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_cancelled_queued_operation_is_dropped_and_not_left_queued():
+    executor = RepositoryExecutor("read", max_workers=1, timeout=5.0)
+    release = threading.Event()
+    ran = []
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.01)
+        # e.g. the client disconnected while its read was still queued
+        queued = asyncio.ensure_future(executor.run(ran.append, "late"))
+        await asyncio.sleep(0.01)
+        assert executor.stats()["queued"] == 1
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        release.set()
+        await running
+        await executor.run(lambda: None)
+
+    try:
+        asyncio.run(scenario())
+        assert ran == []
+        stats = executor.stats()
+        assert stats["queued"] == 0
+        assert stats["dropped"] == 1
+        assert stats["timeouts"] == 0
+    finally:
+        release.set()
+        executor.shutdown()
@@ -0,0 +1,153 @@
+import csv
+import io
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from app.repositories.conversations import ConversationRepository
+from app.services import export
+from app.services.export import ARROW, CONVERSATIONS, CSV, MESSAGES, ExportJob
+from tests.conftest import build_conversation
+
+BASE = datetime(2024, 1, 15, tzinfo=timezone.utc)
+
+
+def intercom_payload() -> dict:
+    author = {"type": "user", "id": "u1", "name": "", "email": ""}
+    return {
+        "type": "conversation",
+        "id": "export-1",
+        "created_at": 1567693209,
+        "updated_at": 1568367881,
+        "conversation_message": {"id": "m1", "body": "<p>Hi</p>", "author": author},
+        "conversation_parts": {
+            "type": "conversation_part.list",
+            "conversation_parts": [{"id": "m2", "body": "Thanks", "created_at": 1567693273, "author": author}],
+            "total_count": 1,
+        },
+    }
+
+
+@pytest.fixture()
+def repo(tmp_path: Path) -> ConversationRepository:
+    repo = ConversationRepository(db_path=str(tmp_path / "kbms.sqlite3"))
+    repo._init_db()
+    for n in range(5):
+        repo.upsert(build_conversation(f"ext-{n}", created_at=BASE, updated_at=BASE + timedelta(days=n)))
+    return repo
+
+
+def test_pages_cover_every_conversation_once_in_ingestion_order(repo):
+    seen, cursor, pages = [], 0, 0
+    while cursor is not None:
+        conversations, cursor = repo.conversations_after(cursor, 2, None)
+        assert len(conversations) <= 2
+        seen.extend(c.external_id for c in conversations)
+        pages += 1
+
+    assert seen == [f"ext-{n}" for n in range(5)]
+    assert pages == 3
+
+
+def test_updated_since_is_inclusive_and_naive_means_utc(repo):
+    conversations, _ = repo.conversations_after(0, 100, datetime(2024, 1, 18))
+    assert [c.external_id for c in conversations] == ["ext-3", "ext-4"]
+
+
+def test_csv_job_writes_flat_message_and_conversation_rows(repo, tmp_path):
+    job = ExportJob(repo, str(tmp_path / "out"), CSV, batch_size=2)
+    assert job.run() == {CONVERSATIONS: 5, MESSAGES: 10}
+    assert job.watermark == 5
+
+    with open(job.path(MESSAGES), newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == [column.name for column in export.MESSAGE_COLUMNS]
+    assert rows[0]["external_id"] == "ext-0"
+    assert rows[0]["author_role"] == "customer"
+    assert rows[0]["content_length"] == str(len("<p>Hi</p>"))
+    assert rows[0]["content_text"] == "Hi"
+    assert rows[1]["author_role"] == "admin"
+    assert rows[1]["content"] == "Hello, how can we help?"
+    assert rows[1]["content_text"] == ""
+    assert rows[1]["sent_at"] == (BASE + timedelta(minutes=5)).isoformat()
+
+    with open(job.path(CONVERSATIONS), newline="", encoding="utf-8") as f:
+        conversations = list(csv.DictReader(f))
+    assert [row["message_count"] for row in conversations] == ["2"] * 5
+
+    # updated_since only filters: it keeps the latest conversation and leaves the watermark alone
+    assert job.run(updated_since=BASE + timedelta(days=4)) == {CONVERSATIONS: 1, MESSAGES: 2}
+    assert job.watermark == 5
+
+
+def test_incremental_export_includes_late_arrivals_with_old_timestamps(repo, tmp_path):
+    job = ExportJob(repo, str(tmp_path / "out"), CSV)
+    job.run()
+
+    # Ingested after the export, but last updated before everything already exported
+    repo.upsert(build_conversation("late", created_at=BASE, updated_at=BASE - timedelta(days=30)))
+
+    assert job.run(after=job.watermark) == {CONVERSATIONS: 1, MESSAGES: 2}
+    with open(job.path(CONVERSATIONS), newline="", encoding="utf-8") as f:
+        assert [row["external_id"] for row in csv.DictReader(f)] == ["late"]
+    assert job.watermark == 6
+    assert job.run(after=job.watermark) == {CONVERSATIONS: 0, MESSAGES: 0}
+
+
+def test_arrow_job_writes_typed_ipc_stream(repo, tmp_path):
+    pa = pytest.importorskip("pyarrow")
+
+    job = ExportJob(repo, str(tmp_path / "out"), ARROW, batch_size=2)
+    job.run()
+
+    with pa.OSFile(job.path(MESSAGES), "rb") as f:
+        table = pa.ipc.open_stream(f).read_all()
+    assert table.num_rows == 10
+    assert table.schema.field("sent_at").type == pa.timestamp("us", tz="UTC")
+    assert table.schema.field("content_length").type == pa.int64()
+    assert table.column("author_role").to_pylist()[:2] == ["customer", "admin"]
+
+
+def test_export_endpoint_streams_csv(client):
+    assert client.post("/integrations/intercom/conversations", json=intercom_payload()).status_code == 201
+
+    response = client.get("/internal/export/messages")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert rows and all(row["external_id"] == rows[0]["external_id"] for row in rows)
+    assert response.headers["x-export-watermark"] == "1"
+
+    caught_up = client.get("/internal/export/messages", params={"after": 1})
+    assert caught_up.headers["x-export-watermark"] == "1"
+    assert caught_up.text.strip() == ",".join(column.name for column in export.MESSAGE_COLUMNS)
+
+    future = client.get("/internal/export/conversations", params={"updated_since": "2100-01-01T00:00:00Z"})
+    assert future.text.strip() == ",".join(column.name for column in export.CONVERSATION_COLUMNS)
+
+
+def test_export_endpoint_rejects_arrow_without_pyarrow(client, monkeypatch):
+    monkeypatch.setattr(export, "pa", None)
+
+    response = client.get("/internal/export/messages", params={"format": "arrow"})
+    assert response.status_code == 400
+    assert response.json()["error_code"] == "unsupported_format"
+
+
+def test_export_endpoint_reads_and_encodes_pages_off_the_event_loop(client, monkeypatch):
+    assert client.post("/integrations/intercom/conversations", json=intercom_payload()).status_code == 201
+    threads = []
+    encode = export.CsvEncoder.encode
+
+    def recording_encode(self, batch):
+        threads.append(threading.current_thread().name)
+        return encode(self, batch)
+
+    monkeypatch.setattr(export.CsvEncoder, "encode", recording_encode)
+
+    response = client.get("/internal/export/messages", params={"batch_size": 1})
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 3  # header + 2 messages
+    assert threads and all(name.startswith("repo-read") for name in threads)
@@ -0,0 +1,46 @@
+import json
+
+from loadtest.loadgen import arrival_schedule, percentile
+from loadtest.webhooks import WebhookSimulator, parse_mix
+
+
+def test_arrival_schedule_is_fixed_rate_plus_bursts_in_order():
+    offsets = list(arrival_schedule(rate=10, duration=2, burst_every=1, burst_size=5))
+
+    assert len(offsets) == 10 * 2 + 5
+    assert offsets == sorted(offsets)
+    assert offsets.count(1.0) == 5 + 1  # burst lands together with the steady request at t=1s
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 1001)]
+    assert percentile(values, 50) == 500.0
+    assert percentile(values, 99) == 990.0
+    assert percentile(values, 99.9) == 999.0
+
+
+def test_simulator_builds_new_updates_and_exact_redeliveries():
+    template = {
+        "id": "1",
+        "created_at": 1567693209,
+        "updated_at": 1567693209,
+        "conversation_message": {"body": "hi", "author": {"id": "u1"}},
+        "conversation_parts": {"conversation_parts": [
+            {"id": "p1", "body": "part", "created_at": 1567693273, "author": {"id": "u1"}}
+        ]},
+    }
+    simulator = WebhookSimulator(template, mix=parse_mix("new=1,update=1,redelivery=1"), seed=7)
+
+    requests = [simulator.next_request() for _ in range(300)]
+    by_operation = {op: [r for r in requests if r.operation == op] for op in ("new", "update", "redelivery")}
+
+    assert requests[0].operation == "new"
+    assert all(by_operation.values())
+    assert len({json.loads(r.body)["id"] for r in by_operation["new"]}) == len(by_operation["new"])
+
+    sent = {r.body for r in requests if r.operation != "redelivery"}
+    assert all(r.body in sent for r in by_operation["redelivery"])
+
+    update = json.loads(by_operation["update"][0].body)
+    assert update["updated_at"] > update["created_at"]
+    assert len(update["conversation_parts"]["conversation_parts"]) >= 2
@@ -0,0 +1,188 @@
+import gzip
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from app.repositories import conversations
+from app.repositories.conversations import ConversationRepository
+from app.repositories.partitions import ACTIVE, ARCHIVED, months_before
+from app.services.archival import ArchivalJob
+from tests.conftest import build_conversation
+
+
+def repo_at(tmp_path: Path, month: int) -> ConversationRepository:
+    repo = ConversationRepository(
+        db_path=str(tmp_path / "kbms.sqlite3"),
+        clock=lambda: datetime(2024, month, 10, tzinfo=timezone.utc),
+    )
+    repo._init_db()
+    return repo
+
+
+def test_months_before_wraps_years():
+    assert months_before("2024-03", 2) == "2024-01"
+    assert months_before("2024-03", 3) == "2023-12"
+
+
+def test_rows_land_in_ingestion_month_partition_and_dedup_across_partitions(tmp_path):
+    january = repo_at(tmp_path, 1)
+    first_id, _ = january.upsert(build_conversation("a"))
+
+    march = repo_at(tmp_path, 3)
+    assert march.upsert(build_conversation("a")) == (first_id, True)
+    march.upsert(build_conversation("b"))
+
+    assert march.partitions() == ["2024-01", "2024-03"]
+    assert (tmp_path / "kbms.2024-01.sqlite3").exists()
+    assert {item.external_id for item in march.list_conversations().items} == {"a", "b"}
+
+
+def test_archival_moves_cold_partitions_and_reads_fall_back_to_archive(tmp_path):
+    january = repo_at(tmp_path, 1)
+    archived_id, _ = january.upsert(build_conversation("old"))
+
+    june = repo_at(tmp_path, 6)
+    hot_id, _ = june.upsert(build_conversation("new"))
+
+    assert ArchivalJob(june, retention_months=3).run() == {"2024-01": 1}
+
+    assert june.partitions(status=ARCHIVED) == ["2024-01"]
+    assert june.partitions(status=ACTIVE) == ["2024-06"]
+    assert not (tmp_path / "kbms.2024-01.sqlite3").exists()
+    assert (tmp_path / "archive" / "kbms.2024-01.jsonl.gz").exists()
+
+    # Hot list only reads active partitions; archived ids still resolve by id
+    assert [item.id for item in june.list_conversations().items] == [hot_id]
+    archived = june.get_conversation(archived_id)
+    assert archived is not None and archived.external_id == "old"
+
+    # Dedup still sees archived conversations
+    assert june.upsert(build_conversation("old")) == (archived_id, True)
+
+    # Nothing left to do on a second run
+    assert ArchivalJob(june, retention_months=3).run() == {}
+
+
+def test_legacy_single_table_is_migrated_into_partitions(tmp_path):
+    db_path = tmp_path / "kbms.sqlite3"
+    conversation = build_conversation("legacy")
+    with sqlite3.connect(db_path) as connection:
+        connection.execute(
+            """
+            CREATE TABLE conversations (
+              id TEXT PRIMARY KEY, provider TEXT NOT NULL, external_id TEXT NOT NULL,
+              created_at TEXT NOT NULL, updated_at TEXT, payload_json TEXT NOT NULL,
+              UNIQUE(provider, external_id)
+            )
+            """
+        )
+        connection.execute(
+            "INSERT INTO conversations VALUES (?, ?, ?, ?, ?, ?)",
+            (str(conversation.id), "intercom", "legacy", conversation.created_at.isoformat(), None,
+             conversation.model_dump_json()),
+        )
+    connection.close()
+
+    repo = repo_at(tmp_path, 6)
+
+    assert repo.partitions() == ["2024-01"]
+    assert repo.get_conversation(conversation.id) == conversation
+    assert repo.upsert(build_conversation("legacy")) == (conversation.id, True)
+    with sqlite3.connect(db_path) as connection:
+        assert connection.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        assert connection.execute(
+            "SELECT count(*) FROM sqlite_master WHERE name='conversations'"
+        ).fetchone()[0] == 0
+
+
+def test_reads_skip_a_partition_only_if_it_was_archived_meanwhile(tmp_path):
+    january = repo_at(tmp_path, 1)
+    january.upsert(build_conversation("old"))
+    june = repo_at(tmp_path, 6)
+    hot_id, _ = june.upsert(build_conversation("new"))
+    ArchivalJob(june, retention_months=3).run()
+
+    # Stale catalog read: 2024-01 was listed as active, then archived and deleted
+    june.partitions = lambda status=None: ["2024-01", "2024-06"]
+    assert [item.id for item in june.list_conversations().items] == [hot_id]
+
+
+def test_reads_fail_loudly_when_an_active_partition_is_unreadable(tmp_path):
+    repo = repo_at(tmp_path, 1)
+    conversation_id, _ = repo.upsert(build_conversation("a"))
+    (tmp_path / "kbms.2024-01.sqlite3").unlink()
+
+    with pytest.raises(sqlite3.OperationalError):
+        repo.list_conversations()
+    with pytest.raises(sqlite3.OperationalError):
+        repo.conversations_after(0, 10)
+    with pytest.raises(sqlite3.OperationalError):
+        repo.get_conversation(conversation_id)
+
+
+def test_index_rows_whose_payload_was_lost_are_dropped_at_startup(tmp_path):
+    repo = repo_at(tmp_path, 1)
+    kept_id, _ = repo.upsert(build_conversation("kept"))
+    # What a crash mid-COMMIT of the old single (two-file) transaction could leave behind
+    lost = build_conversation("lost")
+    with sqlite3.connect(tmp_path / "kbms.sqlite3") as connection:
+        connection.execute(
+            "INSERT INTO conversation_index (id, provider, external_id, created_at, partition) VALUES (?, ?, ?, ?, ?)",
+            (str(lost.id), "intercom", "lost", lost.created_at.isoformat(), "2024-01"),
+        )
+        connection.execute(
+            "INSERT INTO conversation_events (conversation_id, partition, item_json) VALUES (?, ?, ?)",
+            (str(lost.id), "2024-01", "{}"),
+        )
+    connection.close()
+
+    restarted = repo_at(tmp_path, 1)
+
+    assert restarted.get_conversation(lost.id) is None
+    assert [event.item.id for event in restarted.events_since(0, 10)] == [kept_id]
+    # The redelivery is stored for real instead of being deduplicated to a 404
+    redelivered = build_conversation("lost")
+    assert restarted.upsert(redelivered) == (redelivered.id, False)
+    assert restarted.get_conversation(redelivered.id) == redelivered
+
+
+def test_payloads_without_an_index_row_stay_invisible_and_losers_clean_up(tmp_path):
+    repo = repo_at(tmp_path, 1)
+    winner_id, _ = repo.upsert(build_conversation("a"))
+    # Crash between the payload commit and the index commit
+    repo._write_payload("2024-01", build_conversation("orphan"))
+    assert [item.id for item in repo.list_conversations().items] == [winner_id]
+
+    # Lost dedup race: the fast-path lookup missed the row another worker just indexed
+    repo._find_id = lambda provider, external_id: None
+    loser = build_conversation("a")
+    assert repo.upsert(loser) == (winner_id, True)
+    with sqlite3.connect(tmp_path / "kbms.2024-01.sqlite3") as connection:
+        stored = {row[0] for row in connection.execute("SELECT id FROM conversations")}
+    connection.close()
+    assert str(loser.id) not in stored
+
+
+def test_archived_reads_decompress_one_batch_via_the_offsets_sidecar(tmp_path, monkeypatch):
+    monkeypatch.setattr(conversations, "ARCHIVE_BATCH_SIZE", 2)
+    january = repo_at(tmp_path, 1)
+    ids = [january.upsert(build_conversation(str(n)))[0] for n in range(5)]
+    june = repo_at(tmp_path, 6)
+    june.archive_partition("2024-01")
+
+    archive_path = tmp_path / "archive" / "kbms.2024-01.jsonl.gz"
+    offsets_path = tmp_path / "archive" / "kbms.2024-01.offsets.sqlite3"
+    # Still one plain .jsonl.gz for bulk consumers (three gzip members)
+    with gzip.open(archive_path, "rt", encoding="utf-8") as archive:
+        assert len(archive.readlines()) == 5
+    with sqlite3.connect(offsets_path) as connection:
+        assert connection.execute("SELECT count(DISTINCT member_offset) FROM offsets").fetchone()[0] == 3
+    connection.close()
+
+    assert [june.get_conversation(conversation_id).id for conversation_id in ids] == ids
+
+    # Archives written before sidecars existed are still read (by a full scan)
+    offsets_path.unlink()
+    assert june.get_conversation(ids[-1]).id == ids[-1]